@@ -1,14 +1,42 @@
 import streamlit as st
 
 from poker.trainer.puzzles import PUZZLES
-from poker.trainer.engine import calculate_multi_way_equity
-from poker.trainer.llm import get_llm_explanation
 import random
 from poker.ui.poker_table_ui import render_poker_table
 
-random.shuffle(PUZZLES)
+# --- Cached across reruns ---
+# Streamlit reruns this script on every click; the engine and each puzzle's
+# results are computed once and reused.
+@st.cache_resource
+def get_engine():
+    # the engine and grader are only needed once an action is chosen
+    from poker.trainer.engine import PROFILES
+    from poker.trainer.grading import grade_puzzle
+    return PROFILES, grade_puzzle
+
+def opponent_ranges(puzzle):
+    # part of the cache keys, so editing a profile file invalidates its results
+    profiles = get_engine()[0]
+    return tuple(profiles.get(op.type).text for op in puzzle.opponents)
+
+@st.cache_data(max_entries=64)
+def range_grid(villain_range, board_cards):
+    # 169 classes in one pass; the grid module also caches per board texture
+    from poker.trainer.hand_grid import equity_grid
+    return equity_grid(villain_range, board_cards)
+
+@st.cache_data(max_entries=256)
+def puzzle_grade(puzzle_id, ranges):
+    # the equity shown comes from the same simulation that picks the action
+    _, grade_puzzle = get_engine()
+    return grade_puzzle(PUZZLES[puzzle_id], seed=puzzle_id)
 
 # Initialize session state
+if "puzzle_order" not in st.session_state:
+    # indices into PUZZLES, shuffled once per session
+    order = list(range(len(PUZZLES)))
+    random.shuffle(order)
+    st.session_state.puzzle_order = order
 if "puzzle_index" not in st.session_state:
     st.session_state.puzzle_index = 0
 if "show_result" not in st.session_state:
@@ -17,7 +45,9 @@ if "user_action" not in st.session_state:
     st.session_state.user_action = None
 
 # Load current puzzle
-puzzle = PUZZLES[st.session_state.puzzle_index]
+order = st.session_state.puzzle_order
+puzzle_id = order[st.session_state.puzzle_index]
+puzzle = PUZZLES[puzzle_id]
 
 st.title("🃏 Poker Trainer – Puzzle Mode")
 
@@ -62,24 +92,11 @@ with col3:
 
 # --- Process Result ---
 if st.session_state.show_result:
-    opponent_types = [op.type for op in puzzle.opponents]
-
-    equity_result = calculate_multi_way_equity(
-        puzzle.player_hand,
-        puzzle.board_cards,
-        opponent_types,
-        num_simulations=5000
-    )
-
-    pot_odds_percentage = (puzzle.bet_to_call / (puzzle.pot_size + puzzle.bet_to_call)) * 100
-    player_equity = equity_result["player_win_percentage"] + equity_result["tie_percentage"] / 2
-
-    if player_equity > pot_odds_percentage + 15:
-        correct_action = "raise"
-    elif player_equity > pot_odds_percentage:
-        correct_action = "call"
-    else:
-        correct_action = "fold"
+    ranges = opponent_ranges(puzzle)
+    grade = puzzle_grade(puzzle_id, ranges)
+    correct_action = grade["correct_action"]
+    pot_odds_percentage = grade["pot_odds_percentage"]
+    player_equity = grade["equity_percentage"]
 
     st.markdown("### ✅ **Result:**")
     if st.session_state.user_action == correct_action:
@@ -87,22 +104,35 @@ if st.session_state.show_result:
     else:
         st.error(f"Incorrect. The correct action was **{correct_action.upper()}**.")
 
-    st.markdown(f"**Your equity (win + tie/2):** {player_equity:.2f}%")
+    st.markdown(f"**Your equity (share of the pot):** {player_equity:.2f}%")
     st.markdown(f"**Pot odds required:** {pot_odds_percentage:.2f}%")
+    ev = grade["ev"]
+    st.markdown(
+        f"**EV (chips):** fold {ev['fold']:+.1f} | call {ev['call']:+.1f}"
+        + (f" | raise {grade['raise_amount']} {ev['raise']:+.1f}" if ev["raise"] is not None else "")
+    )
 
     with st.expander("See Full Equity Breakdown"):
-        st.json(equity_result)
+        st.json(grade)
+
+    # a checkbox rather than an expander: expander contents are computed even when collapsed
+    if st.checkbox("Show hand grid vs. each opponent's range"):
+        from poker.ui.hand_grid_ui import render_hand_grid
+        for i, (op, villain_range) in enumerate(zip(puzzle.opponents, ranges)):
+            st.markdown(f"**Opponent {i+1} ({op.type})**")
+            render_hand_grid(range_grid(villain_range, puzzle.board_cards))
 
     # --- LLM Explanation Button ---
     if st.button("Explain this decision (AI)"):
+        from poker.trainer.llm import get_llm_explanation
         with st.spinner("Generating explanation..."):
-            explanation = get_llm_explanation(puzzle, st.session_state.user_action, correct_action, equity_result)
+            explanation = get_llm_explanation(puzzle, st.session_state.user_action, correct_action, grade)
         st.markdown("### 🤖 AI Explanation")
         st.write(explanation)
 
     # --- Next Puzzle Button ---
     if st.button("Next Puzzle"):
-        st.session_state.puzzle_index = (st.session_state.puzzle_index + 1) % len(PUZZLES)
+        st.session_state.puzzle_index = (st.session_state.puzzle_index + 1) % len(order)
         st.session_state.show_result = False
         st.session_state.user_action = None
 
@@ -1,4 +1,9 @@
 from collections import defaultdict
+from poker.trainer.abstraction import CardAbstraction, STREETS
+from poker.trainer.models import Card, Deck
+from poker.trainer.strategy import save_strategy
+
+ABSTRACTION = CardAbstraction(num_buckets=10)
 
 regret_sum = defaultdict(lambda: [0.0, 0.0, 0.0]) # fold, call, raise
 strategy_sum = defaultdict(lambda: [0.0, 0.0, 0.0])
@@ -22,7 +27,7 @@ class PokerState:
 
     def get_infoset_key(self, player):
         # Returns bucketed infoset key for this player in this state
-        hole_bucket = bucket_hole_cards(self.hole_cards[player])
+        hole_bucket = bucket_hole_cards(self.hole_cards[player], self.board_cards)
         board_bucket = bucket_board(self.board_cards)
         return (hole_bucket, board_bucket, tuple(self.betting_history))
 
@@ -40,23 +45,13 @@ class PokerState:
             terminal=True,
             utility=1 if action == 'raise' else -1
         )
-def bucket_hole_cards(hole_cards):
-    # Simplified: return 'high', 'medium', or 'low' based on highest card rank
-    ranks = [card.rank_value for card in hole_cards]
-    if max(ranks) >= 12: # Q,K,A
-        return 'high'
-    elif max(ranks) >= 9: # 9,J,T
-        return 'medium'
-    else:
-        return 'low'
+def bucket_hole_cards(hole_cards, board_cards=()):
+    # Equity bucket (0 = weakest) of the hole cards on this board, see poker.trainer.abstraction
+    return ABSTRACTION.bucket([card.id for card in hole_cards], [card.id for card in board_cards])
 
 def bucket_board(board_cards):
-    # Simplified: return 'dry' or 'wet' flop
-    suits = [card.suit_char for card in board_cards]
-    if len(set(suits)) == 3:
-        return 'dry'
-    else:
-        return 'wet'
+    # Street of the board; board texture is already part of the equity bucket
+    return STREETS[len(board_cards)]
 
 
 def get_strategy(infoset, regret_sum):
@@ -94,60 +89,14 @@ def cfr(state, player, probability):
 
 # Initialize mock state
 
-class Card:
-    RANKS = {
-        '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7,
-        '8': 8, '9': 9, 'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-    }
-    SUITS = {'h', 'd', 'c', 's'}
-
-    def __init__(self, rank_char, suit_char):
-        if rank_char not in self.RANKS:
-            raise ValueError(f"Invalid rank character: {rank_char}")
-        if suit_char not in self.SUITS:
-            raise ValueError(f"Invalid suit character: {suit_char}")
-        self.rank_char = rank_char
-        self.suit_char = suit_char
-        self.rank_value = self.RANKS[rank_char]
-
-    def __str__(self):
-        return f"{self.rank_char}{self.suit_char}"
-
-    def __repr__(self):
-        return f"Card('{self.rank_char}', '{self.suit_char}')"
-
-    def __eq__(self, other):
-        return self.rank_char == other.rank_char and self.suit_char == other.suit_char
-
-    def __hash__(self):
-        return hash((self.rank_char, self.suit_char))
-
-import random
-
-class Deck:
-    def __init__(self):
-        self.cards = [Card(rank, suit) for rank in Card.RANKS.keys() for suit in Card.SUITS]
-        random.shuffle(self.cards)
-
-    def deal(self, num_cards):
-        if num_cards > len(self.cards):
-            raise ValueError("Not enough cards left in the deck")
-        dealt = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
-        return dealt
-
-    def remove_cards(self, cards_to_remove):
-        for card in cards_to_remove:
-            if card in self.cards:
-                self.cards.remove(card)
-
 # Example test cases
-print(bucket_hole_cards([Card('A','s'), Card('Q','h')]))  # should print 'high'
-print(bucket_hole_cards([Card('T','s'), Card('9','h')]))  # should print 'medium'
-print(bucket_hole_cards([Card('7','s'), Card('4','h')]))  # should print 'low'
+print(bucket_hole_cards([Card('A','s'), Card('Q','h')]))  # high bucket
+print(bucket_hole_cards([Card('T','s'), Card('9','h')]))  # middle bucket
+print(bucket_hole_cards([Card('7','s'), Card('2','h')]))  # low bucket
 
-print(bucket_board([Card('K','s'), Card('7','h'), Card('2','c')])) # 'dry'
-print(bucket_board([Card('J','h'), Card('8','h'), Card('2','c')])) # 'wet'
+print(bucket_hole_cards([Card('A','s'), Card('Q','h')], [Card('K','s'), Card('7','h'), Card('2','c')])) # ace high, no pair
+print(bucket_hole_cards([Card('A','s'), Card('Q','h')], [Card('A','h'), Card('Q','c'), Card('2','c')])) # top two pair
+print(bucket_board([Card('J','h'), Card('8','h'), Card('2','c')])) # 'flop'
 
 # Create card objects
 card1 = Card('A', 's')
@@ -167,7 +116,7 @@ state = PokerState(
     utility = 0
 )
 
-print(state.get_infoset_key(0))  # should show ('high', 'dry', ())
+print(state.get_infoset_key(0))  # should show (<bucket>, 'flop', ())
 
 next_state = state.next_state('raise')
 print(next_state.pot)            # should be 11
@@ -191,3 +140,7 @@ for i in range(10):
 
 print("Regret Sum:", dict(regret_sum))
 print("Strategy Sum:", dict(strategy_sum))
+
+# Export the average strategy for StrategyPolicy (poker/trainer/strategy.py)
+if __name__ == "__main__":
+    save_strategy(strategy_sum, "average_strategy.json", ABSTRACTION)
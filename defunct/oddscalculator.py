@@ -1,86 +1,11 @@
+import os
 import random
+import sys
 from collections import Counter
 from itertools import combinations
 
-class Card:
-    """Represents a playing card."""
-    SUITS = {'h': 'Hearts', 'd': 'Diamonds', 'c': 'Clubs', 's': 'Spades'}
-    RANKS = {
-        '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-        'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-    }
-    RANK_CHARS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-
-    def __init__(self, rank_char, suit_char):
-        """
-        Initializes a Card object.
-        Args:
-            rank_char (str): The character representing the card's rank (e.g., 'K', 'A', '7').
-            suit_char (str): The character representing the card's suit (e.g., 'h', 'c').
-        Raises:
-            ValueError: If an invalid rank or suit character is provided.
-        """
-        if rank_char not in self.RANKS:
-            raise ValueError(f"Invalid rank character: {rank_char}")
-        if suit_char not in self.SUITS:
-            raise ValueError(f"Invalid suit character: {suit_char}")
-
-        self.rank_char = rank_char
-        self.suit_char = suit_char
-        self.rank_value = self.RANKS[rank_char] # Numerical value for comparison
-
-    def __str__(self):
-        """Returns a string representation of the card (e.g., 'Kh')."""
-        return f"{self.rank_char}{self.suit_char}"
-
-    def __repr__(self):
-        """Returns a developer-friendly representation."""
-        return f"Card('{self.rank_char}', '{self.suit_char}')"
-
-    def __eq__(self, other):
-        """Checks if two cards are equal."""
-        if not isinstance(other, Card):
-            return NotImplemented
-        return self.rank_char == other.rank_char and self.suit_char == other.suit_char
-
-    def __hash__(self):
-        """Enables Card objects to be used in sets/dictionaries."""
-        return hash((self.rank_char, self.suit_char))
-
-class Deck:
-    """Represents a standard 52-card deck."""
-    def __init__(self):
-        """Initializes a new, shuffled deck."""
-        self.cards = [Card(r, s) for s in Card.SUITS.keys() for r in Card.RANKS.keys()]
-        random.shuffle(self.cards)
-
-    def deal(self, num_cards):
-        """
-        Deals a specified number of cards from the top of the deck.
-        Args:
-            num_cards (int): The number of cards to deal.
-        Returns:
-            list: A list of dealt Card objects.
-        Raises:
-            ValueError: If not enough cards in the deck.
-        """
-        if num_cards > len(self.cards):
-            raise ValueError("Not enough cards in the deck to deal.")
-        dealt_cards = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
-        return dealt_cards
-
-    def remove_cards(self, cards_to_remove):
-        """
-        Removes specified cards from the deck.
-        Useful for setting up known cards (player hand, board cards).
-        Args:
-            cards_to_remove (list): A list of Card objects to remove.
-        """
-        for card_to_remove in cards_to_remove:
-            # Only remove if the card is actually in the deck to avoid errors
-            if card_to_remove in self.cards:
-                self.cards.remove(card_to_remove)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from poker.trainer.models import Card, Deck
 
 def parse_hand_string(hand_string):
     """
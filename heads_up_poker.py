@@ -1,31 +1,42 @@
-from treys import Card, Deck
-import random
+from poker.trainer.heads_up_game import HeadsUpGame
 import sys
 
+PLAYER, AI = 0, 1
+
 class HeadsUpPoker:
+    """Console front end for the headless HeadsUpGame engine"""
+
     def __init__(self):
-        self.deck = Deck()
-        self.player_stack = 1000
-        self.ai_stack = 1000
-        self.pot = 0
-        self.community_cards = []
-        self.player_cards = []
-        self.ai_cards = []
+        self.engine = HeadsUpGame(stacks=(1000, 1000))
         self.game_ai = None
+        self.policy = None  # Optional StrategyPolicy; replaces the threshold AI when set
         self.player_first = True  # Track who goes first
-        
-    def deal_cards(self):
-        """Deal hole cards to both players"""
-        self.deck = Deck()
-        self.player_cards = [Card.int_to_str(self.deck.draw(1)[0]) for _ in range(2)]
-        self.ai_cards = [Card.int_to_str(self.deck.draw(1)[0]) for _ in range(2)]
-        self.community_cards = []
-        
-    def deal_community(self, num_cards):
-        """Deal community cards"""
-        for _ in range(num_cards):
-            self.community_cards.append(Card.int_to_str(self.deck.draw(1)[0]))
-            
+
+    # --- Views over the engine state ---
+    @property
+    def player_stack(self):
+        return self.engine.stacks[PLAYER]
+
+    @property
+    def ai_stack(self):
+        return self.engine.stacks[AI]
+
+    @property
+    def pot(self):
+        return self.engine.pot
+
+    @property
+    def player_cards(self):
+        return self.engine.hole_card_strings(PLAYER)
+
+    @property
+    def ai_cards(self):
+        return self.engine.hole_card_strings(AI)
+
+    @property
+    def community_cards(self):
+        return self.engine.board_strings()
+
     def get_user_action(self, current_bet=0):
         """Get action from user"""
         print(f"\nYour cards: {self.player_cards}")
@@ -53,14 +64,12 @@ class HeadsUpPoker:
                 if current_bet == 0:
                     print("No bet to call. Choose bet or check.")
                     continue
-                if current_bet > self.player_stack:
-                    print("Not enough chips to call!")
-                    continue
                 return {'action': 'call', 'amount': current_bet}
             elif action == 'bet':
                 try:
-                    amount = int(input("Bet amount: $"))
-                    if amount > self.player_stack:
+                    prompt = "Raise by: $" if current_bet > 0 else "Bet amount: $"
+                    amount = int(input(prompt))
+                    if amount > self.player_stack - current_bet:
                         print("Not enough chips!")
                         continue
                     if amount <= 0:
@@ -78,474 +87,82 @@ class HeadsUpPoker:
                 
     def get_ai_action(self, current_bet=0):
         """Get action from AI"""
-        # Simple AI logic
-        hand_strength = self.game_ai.get_hand_strength(self.ai_cards, self.community_cards)
-        
-        # More aggressive betting - AI will bet more often
-        if hand_strength > 7:
-            action = 'bet'
-            amount = min(75, self.ai_stack)  # Bigger bets for strong hands
-        elif hand_strength > 6:
-            action = 'bet'
-            amount = min(50, self.ai_stack)
-        elif hand_strength > 5:
-            if current_bet == 0:
-                if random.random() < 0.6:  # 60% chance to bet with decent hands
-                    action = 'bet'
-                    amount = min(30, self.ai_stack)
-                else:
-                    action = 'check'
-                    amount = 0
-            else:
-                action = 'call'
-                amount = current_bet
-        elif hand_strength > 3:
-            if random.random() < 0.4:  # 40% chance to bluff
-                action = 'bet'
-                amount = min(25, self.ai_stack)
-            else:
-                if current_bet == 0:
-                    action = 'check'
-                    amount = 0
-                else:
-                    action = 'fold'
-                    amount = 0
-        else:
-            if random.random() < 0.2:  # 20% chance to bluff
-                action = 'bet'
-                amount = min(15, self.ai_stack)
-            else:
-                if current_bet == 0:
-                    action = 'check'
-                    amount = 0
-                else:
-                    action = 'fold'
-                    amount = 0
-                
-        return {'action': action, 'amount': amount}
+        if self.policy is not None:
+            return self.policy.get_action(
+                self.ai_cards, self.community_cards, self.engine.history,
+                current_bet, self.ai_stack, self.pot
+            )
+        return self.get_threshold_action(current_bet)
+
+    def get_threshold_action(self, current_bet=0):
+        """Hand-strength threshold AI, used when no trained policy is loaded"""
+        return self.game_ai.get_heads_up_action(self.ai_cards, self.community_cards, self.ai_stack, current_bet)
     
     def determine_winner(self):
-        """Determine winner at showdown"""
-        from treys import Evaluator
-        evaluator = Evaluator()
-        
-        player_cards_int = [Card.new(c) for c in self.player_cards]
-        ai_cards_int = [Card.new(c) for c in self.ai_cards]
-        community_int = [Card.new(c) for c in self.community_cards]
-        
-        player_score = evaluator.evaluate(community_int, player_cards_int)
-        ai_score = evaluator.evaluate(community_int, ai_cards_int)
-        
-        # Lower score is better in treys
-        if player_score < ai_score:
-            return 'player'
-        elif ai_score < player_score:
-            return 'ai'
-        else:
-            return 'tie'
-    
+        """Winner of the finished hand: 'player', 'ai' or 'tie'"""
+        return {PLAYER: 'player', AI: 'ai', None: 'tie'}[self.engine.winner]
+
+    def show_event(self, event):
+        """Print one engine event"""
+        kind = event['type']
+        if kind == 'action':
+            who = "You" if event['seat'] == PLAYER else "AI"
+            action, amount = event['action'], event['amount']
+            if action == 'fold':
+                print(f"{who} fold{'s' if who == 'AI' else ''}.")
+            elif action == 'check':
+                print(f"{who} check{'s' if who == 'AI' else ''}")
+            else:
+                print(f"{who} {action}{'s' if who == 'AI' else ''} ${amount}")
+        elif kind == 'refund':
+            who = "you" if event['seat'] == PLAYER else "AI"
+            print(f"${event['amount']} uncalled, returned to {who}")
+        elif kind == 'street':
+            print(f"\n--- {event['street'].upper()} ---")
+            print(f"Community cards: {self.community_cards}")
+        elif kind == 'showdown':
+            print("\n--- SHOWDOWN ---")
+            print(f"Your cards: {self.player_cards}")
+            print(f"AI cards: {self.ai_cards}")
+            print(f"Community cards: {self.community_cards}")
+        elif kind == 'hand_end':
+            winner = event['winner']
+            if winner == PLAYER:
+                print("You win the pot!")
+            elif winner == AI:
+                print("AI wins the pot!")
+            else:
+                print("It's a tie! Pot is split.")
+
     def play_hand(self):
         """Play one complete hand"""
         print("\n" + "="*50)
         print("NEW HAND")
         print("="*50)
-        
-        # Deal cards
-        self.deal_cards()
+
+        events = self.engine.start_hand(button=PLAYER if self.player_first else AI)
         print(f"Your cards: {self.player_cards}")
         print(f"{'You go first' if self.player_first else 'AI goes first'}")
-        
-        # Preflop betting
         print("\n--- PREFLOP ---")
-        current_bet = 0
-        
-        if self.player_first:
-            # Player acts first
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'bet':
-                current_bet = player_action['amount']
-                self.player_stack -= player_action['amount']
-                self.pot += player_action['amount']
-                print(f"You bet ${player_action['amount']}")
-            elif player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'check':
-                print("You check")
-                
-            # AI responds
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-                # Player must respond to AI bet
-                player_action = self.get_user_action(current_bet)
-                if player_action['action'] == 'fold':
-                    print("You fold. AI wins the pot!")
-                    self.ai_stack += self.pot
-                    self.pot = 0
-                    self.player_first = not self.player_first  # Switch for next hand
-                    return 'ai'
-                elif player_action['action'] == 'call':
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-                elif player_action['action'] == 'bet':
-                    self.player_stack -= player_action['amount']
-                    self.pot += player_action['amount']
-                    print(f"You bet ${player_action['amount']}")
-        else:
-            # AI acts first
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-            # Player responds
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'call':
-                if current_bet > 0:
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-            elif player_action['action'] == 'bet':
-                self.player_stack -= player_action['amount']
-                self.pot += player_action['amount']
-                print(f"You bet ${player_action['amount']}")
-            elif player_action['action'] == 'check':
-                print("You check")
-        
-        # Deal flop
-        print("\n--- FLOP ---")
-        self.deal_community(3)
-        print(f"Community cards: {self.community_cards}")
-        
-        # Flop betting (simplified - just one round)
-        current_bet = 0
-        if self.player_first:
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'bet':
-                current_bet = player_action['amount']
-                self.player_stack -= player_action['amount']
-                self.pot += player_action['amount']
-                print(f"You bet ${player_action['amount']}")
-            elif player_action['action'] == 'check':
-                print("You check")
-                
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-                player_action = self.get_user_action(current_bet)
-                if player_action['action'] == 'fold':
-                    print("You fold. AI wins the pot!")
-                    self.ai_stack += self.pot
-                    self.pot = 0
-                    self.player_first = not self.player_first  # Switch for next hand
-                    return 'ai'
-                elif player_action['action'] == 'call':
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-        else:
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'call':
-                if current_bet > 0:
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-            elif player_action['action'] == 'check':
-                print("You check")
-        
-        # Deal turn
-        print("\n--- TURN ---")
-        self.deal_community(1)
-        print(f"Community cards: {self.community_cards}")
-        
-        # Turn betting
-        current_bet = 0
-        if self.player_first:
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'bet':
-                current_bet = player_action['amount']
-                self.player_stack -= player_action['amount']
-                self.pot += player_action['amount']
-                print(f"You bet ${player_action['amount']}")
-            elif player_action['action'] == 'check':
-                print("You check")
-                
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-                player_action = self.get_user_action(current_bet)
-                if player_action['action'] == 'fold':
-                    print("You fold. AI wins the pot!")
-                    self.ai_stack += self.pot
-                    self.pot = 0
-                    self.player_first = not self.player_first  # Switch for next hand
-                    return 'ai'
-                elif player_action['action'] == 'call':
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-        else:
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'call':
-                if current_bet > 0:
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-            elif player_action['action'] == 'check':
-                print("You check")
-        
-        # Deal river
-        print("\n--- RIVER ---")
-        self.deal_community(1)
-        print(f"Community cards: {self.community_cards}")
-        
-        # River betting
-        current_bet = 0
-        if self.player_first:
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'bet':
-                current_bet = player_action['amount']
-                self.player_stack -= player_action['amount']
-                self.pot += player_action['amount']
-                print(f"You bet ${player_action['amount']}")
-            elif player_action['action'] == 'check':
-                print("You check")
-                
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-                player_action = self.get_user_action(current_bet)
-                if player_action['action'] == 'fold':
-                    print("You fold. AI wins the pot!")
-                    self.ai_stack += self.pot
-                    self.pot = 0
-                    self.player_first = not self.player_first  # Switch for next hand
-                    return 'ai'
-                elif player_action['action'] == 'call':
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-        else:
-            ai_action = self.get_ai_action(current_bet)
-            if ai_action['action'] == 'fold':
-                print(f"AI folds. You win the pot!")
-                self.player_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'player'
-            elif ai_action['action'] == 'call':
-                if current_bet > 0:
-                    self.ai_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"AI calls ${current_bet}")
-                else:
-                    print("AI checks")
-            elif ai_action['action'] == 'bet':
-                self.ai_stack -= ai_action['amount']
-                self.pot += ai_action['amount']
-                current_bet = ai_action['amount']
-                print(f"AI bets ${ai_action['amount']}")
-                
-            player_action = self.get_user_action(current_bet)
-            if player_action['action'] == 'fold':
-                print("You fold. AI wins the pot!")
-                self.ai_stack += self.pot
-                self.pot = 0
-                self.player_first = not self.player_first  # Switch for next hand
-                return 'ai'
-            elif player_action['action'] == 'call':
-                if current_bet > 0:
-                    self.player_stack -= current_bet
-                    self.pot += current_bet
-                    print(f"You call ${current_bet}")
-            elif player_action['action'] == 'check':
-                print("You check")
-        
-        # Showdown
-        print("\n--- SHOWDOWN ---")
-        print(f"Your cards: {self.player_cards}")
-        print(f"AI cards: {self.ai_cards}")
-        print(f"Community cards: {self.community_cards}")
-        
-        winner = self.determine_winner()
-        if winner == 'player':
-            print("You win the pot!")
-            self.player_stack += self.pot
-        elif winner == 'ai':
-            print("AI wins the pot!")
-            self.ai_stack += self.pot
-        else:
-            print("It's a tie! Pot is split.")
-            self.player_stack += self.pot // 2
-            self.ai_stack += self.pot // 2
-            
-        self.pot = 0
+
+        while not self.engine.hand_over:
+            for event in events:
+                self.show_event(event)
+            current_bet = self.engine.to_call()
+            if self.engine.to_act == PLAYER:
+                action = self.get_user_action(current_bet)
+            else:
+                action = self.get_ai_action(current_bet)
+            try:
+                events = self.engine.apply_action(action['action'], action['amount'])
+            except ValueError:
+                # AI suggestions that don't fit the spot (e.g. a bet when all-in) fall back to check/call
+                events = self.engine.apply_action('call')
+        for event in events:
+            self.show_event(event)
+
         self.player_first = not self.player_first  # Switch for next hand
-        return winner
+        return self.determine_winner()
     
     def play_game(self):
         """Play 10 hands"""
@@ -557,6 +174,8 @@ class HeadsUpPoker:
         ai_wins = 0
         
         for hand in range(1, 11):
+            if min(self.player_stack, self.ai_stack) == 0:
+                break
             print(f"\nHand {hand}/10")
             winner = self.play_hand()
             
@@ -592,4 +211,8 @@ if __name__ == "__main__":
     
     game = HeadsUpPoker()
     game.game_ai = GameAI()
+    if len(sys.argv) > 1:
+        # Optional trained CFR strategy, e.g. `python heads_up_poker.py average_strategy.json`
+        from poker.trainer.strategy import StrategyPolicy
+        game.policy = StrategyPolicy.load(sys.argv[1])
     game.play_game() 
\ No newline at end of file
@@ -0,0 +1,223 @@
+# poker/benchmark.py
+"""
+Benchmarks for the hot paths: hand evaluation, Monte Carlo equity per
+street and opponent count, range sampling, CFR iterations, self-play and
+/equity/ request latency.
+
+Every benchmark is seeded, so two runs on the same machine do the same
+work. Results are written as JSON. Metrics ending in `_per_sec` are better
+when higher, metrics ending in `_ms` are better when lower; with
+`--baseline` every metric is compared against a stored run and the
+process exits with status 1 if any regressed by more than `--threshold`.
+
+Usage:
+    python -m poker.benchmark --output bench.json
+    python -m poker.benchmark --quick --baseline bench.json --threshold 0.15
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from poker.trainer.evaluator import FULL_DECK, cards_to_str, evaluate
+
+STREET_BOARDS = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds > 0 else float('inf')
+
+
+def bench_evaluator(scale, seed):
+    rng = random.Random(seed)
+    hands = [rng.sample(FULL_DECK, 7) for _ in range(int(100000 * scale))]
+    started = time.perf_counter()
+    for hand in hands:
+        evaluate(hand)
+    seven = _rate(len(hands), time.perf_counter() - started)
+
+    five = [hand[:5] for hand in hands]
+    started = time.perf_counter()
+    for hand in five:
+        evaluate(hand)
+    return {
+        "evaluator.7card_hands_per_sec": seven,
+        "evaluator.5card_hands_per_sec": _rate(len(five), time.perf_counter() - started),
+    }
+
+
+def bench_equity(scale, seed):
+    from poker.trainer.engine import calculate_multi_way_equity
+
+    rng = random.Random(seed)
+    results = {}
+    simulations = max(100, int(2000 * scale))
+    for street, board_size in STREET_BOARDS.items():
+        cards = rng.sample(FULL_DECK, 2 + board_size)
+        hand, board = cards_to_str(cards[:2]), cards_to_str(cards[2:])
+        for opponents in range(1, 6):
+            started = time.perf_counter()
+            calculate_multi_way_equity(hand, board, ['standard'] * opponents, simulations, seed=seed)
+            results[f"equity.{street}.{opponents}_opp.sims_per_sec"] = _rate(
+                simulations, time.perf_counter() - started
+            )
+    return results
+
+
+def bench_ranges(scale, seed):
+    from poker.trainer.engine import PROFILES
+    from poker.trainer.ranges import parse_range
+
+    rng = random.Random(seed)
+    compiled = PROFILES.get('loose')
+    dead_masks = [sum(1 << c for c in rng.sample(FULL_DECK, 7)) for _ in range(int(50000 * scale))]
+    started = time.perf_counter()
+    for dead in dead_masks:
+        compiled.sample(dead, rng)
+    sample_rate = _rate(len(dead_masks), time.perf_counter() - started)
+
+    notation = '22+, A2s+, K9s+, QTs+, JTs, A9o+, KTo+, QJo:0.5'
+    rounds = max(10, int(200 * scale))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        parse_range.cache_clear()
+        parse_range(notation)
+    compile_ms = (time.perf_counter() - started) / rounds * 1000
+    return {
+        "ranges.sample_per_sec": sample_rate,
+        "ranges.compile_ms": compile_ms,
+    }
+
+
+def bench_cfr(scale, seed):
+    # cfr.py is a script that prints a demo when imported; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        import cfr
+    from poker.trainer.models.card import ALL_CARDS
+
+    rng = random.Random(seed)
+    iterations = max(5, int(100 * scale))
+    states = []
+    for _ in range(iterations):
+        cards = [ALL_CARDS[c] for c in rng.sample(FULL_DECK, 7)]
+        states.append(cfr.PokerState(
+            hole_cards={0: cards[0:2], 1: cards[2:4]}, board_cards=cards[4:7],
+            pot=10, stacks={0: 90, 1: 90}, betting_history=[]
+        ))
+    started = time.perf_counter()
+    for state in states:
+        cfr.cfr(state, 0, 1)
+        cfr.cfr(state, 1, 1)
+    return {"cfr.iterations_per_sec": _rate(iterations, time.perf_counter() - started)}
+
+
+def bench_self_play(scale, seed):
+    from poker.trainer.simulator import make_policy, play_pairs
+
+    pairs = max(100, int(5000 * scale))
+    policy = make_policy('bot', random.Random(seed))
+    started = time.perf_counter()
+    play_pairs(policy, policy, pairs, seed=seed)
+    return {"self_play.hands_per_sec": _rate(pairs * 2, time.perf_counter() - started)}
+
+
+def bench_server(scale, seed):
+    try:
+        from fastapi.testclient import TestClient
+        from poker.server.main import app
+    except ImportError as e:
+        print(f"skipping /equity/ latency: {e}", file=sys.stderr)
+        return {}
+
+    client = TestClient(app)
+    body = {
+        "player_hand": "AhKh", "board_cards": "Qh7h2c", "opponent_types": ["standard"],
+        "num_simulations": 1000, "seed": seed,
+    }
+    latencies = []
+    for _ in range(max(5, int(50 * scale))):
+        started = time.perf_counter()
+        client.post("/equity/", json=body).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "server.equity_p50_ms": statistics.median(latencies),
+        "server.equity_p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+
+BENCHMARKS = {
+    'evaluator': bench_evaluator,
+    'equity': bench_equity,
+    'ranges': bench_ranges,
+    'cfr': bench_cfr,
+    'self_play': bench_self_play,
+    'server': bench_server,
+}
+
+
+def run_benchmarks(names=None, scale=1.0, seed=0):
+    metrics = {}
+    for name in names or BENCHMARKS:
+        metrics.update(BENCHMARKS[name](scale, seed))
+    return {
+        "meta": {
+            "seed": seed,
+            "scale": scale,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """Metrics that got worse than the baseline by more than `threshold` (a fraction)."""
+    regressions = []
+    for name, old in baseline["metrics"].items():
+        new = results["metrics"].get(name)
+        if new is None or not old:
+            continue
+        if name.endswith('_ms'):
+            change = (new - old) / old
+        else:
+            change = (old - new) / old
+        if change > threshold:
+            regressions.append({"metric": name, "baseline": old, "current": new, "worse_by": change})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poker trainer benchmarks")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="run at a tenth of the default size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown per metric before it counts as a regression (default 0.10)")
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(args.benchmarks, 0.1 if args.quick else 1.0, args.seed)
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = compare(results, json.load(f), args.threshold)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for regression in results.get("regressions", []):
+        print(f"REGRESSION {regression['metric']}: {regression['baseline']:.4g} -> "
+              f"{regression['current']:.4g} ({regression['worse_by']:+.0%})", file=sys.stderr)
+    sys.exit(1 if results.get("regressions") else 0)
@@ -0,0 +1,142 @@
+# poker/metrics.py
+"""
+In-process metrics with Prometheus text exposition.
+
+`METRICS` is the process-wide registry. Hot paths record per-stage timings
+with `METRICS.timer('equity.simulate')` (or `observe` when they already have
+the duration), which lands in the `poker_stage_seconds` histogram labelled by
+stage. Counters, gauges and the hit rates of registered lru caches are
+rendered alongside, so the server's /metrics endpoint is just `render()`.
+Recording is a dict lookup and a few additions under a lock, cheap enough to
+do once per call of anything that runs a simulation.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; wide enough for a 1ms cache hit and a multi-second LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # name -> {labels: Histogram}
+        self.counters = {}  # name -> {labels: value}
+        self.gauges = {}  # name -> {labels: value}
+        self.caches = {}  # name -> cache_info callable of an lru_cache
+        self.help = {}
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def observe(self, name, value, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def stage(self, stage, seconds):
+        self.observe('poker_stage_seconds', seconds, stage=stage)
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage(stage, time.perf_counter() - started)
+
+    def inc(self, name, amount=1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def register_cache(self, name, cache_info):
+        """Reports the hits and misses of an lru_cache, given its `cache_info` method."""
+        self.caches[name] = cache_info
+
+    def render(self):
+        lines = []
+
+        def header(name, kind):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                header(name, 'counter')
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for name, series in sorted(self.gauges.items()):
+                header(name, 'gauge')
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for name, series in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        if self.caches:
+            for metric, field in (('poker_cache_hits_total', 'hits'), ('poker_cache_misses_total', 'misses')):
+                header(metric, 'counter')
+                for cache, cache_info in sorted(self.caches.items()):
+                    lines.append(f'{metric}{{cache="{cache}"}} {getattr(cache_info(), field)}')
+            header('poker_cache_hit_ratio', 'gauge')
+            for cache, cache_info in sorted(self.caches.items()):
+                info = cache_info()
+                lookups = info.hits + info.misses
+                lines.append(f'poker_cache_hit_ratio{{cache="{cache}"}} {info.hits / lookups if lookups else 0.0!r}')
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()
+METRICS.describe('poker_stage_seconds', 'Time spent in each instrumented stage.')
+METRICS.describe('poker_equity_simulations_total', 'Monte Carlo trials run by the equity engine.')
+METRICS.describe('poker_equity_simulations_per_second', 'Trial rate of the most recent equity calculation.')
@@ -0,0 +1,61 @@
+# poker/profiler.py
+"""
+A small sampling profiler for profiling single server requests.
+
+While running, a background thread snapshots the stack of one thread (the
+one that started the profiler, unless told otherwise) every `interval`
+seconds and counts each distinct stack, so concurrent requests on other
+threads stay out of the profile. A request that moves to another thread,
+as FastAPI's sync endpoints do, calls `follow()` from there. `stop()`
+returns the counts in folded format ("outer;inner;leaf count" per line),
+which flamegraph.pl and speedscope read directly.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.001, max_depth=64, thread_id=None):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def follow(self, thread_id=None):
+        """Samples `thread_id` (the calling thread by default) from now on; returns the thread sampled until now."""
+        previous = self.thread_id
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        return previous
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.folded()
+
+    def folded(self):
+        return '\n'.join(f"{stack} {count}" for stack, count in self.samples.most_common()) + '\n'
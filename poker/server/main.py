@@ -1,13 +1,71 @@
-from fastapi import FastAPI, HTTPException
+import time
+_import_started = time.perf_counter()
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import secrets
+from collections import OrderedDict
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
-from typing import List
-from poker.trainer.puzzles import PUZZLES
-from poker.trainer.engine import calculate_multi_way_equity, simulate_showdown
-from poker.trainer.llm import get_llm_explanation
+from typing import List, Optional
+from poker.trainer import puzzles
+from poker.metrics import METRICS
+from poker.profiler import SamplingProfiler
+from poker.server.sessions import SessionManager
 from fastapi.middleware.cors import CORSMiddleware
 
+# The engine, grader, LLM client and trained strategy are imported in the
+# endpoints that use them, so a new worker starts serving without paying for
+# subsystems it may never need; each loads once, on its first request.
+
 app = FastAPI()
 
+STRATEGY_PATH = os.environ.get("POKER_STRATEGY_PATH", "average_strategy.json")
+_policy = None
+_session_ai = None
+
+def strategy_available():
+    # the strategy is only served with its prebuilt bucket tables
+    from poker.trainer.strategy import bucket_tables_path
+    return os.path.exists(STRATEGY_PATH) and os.path.exists(bucket_tables_path(STRATEGY_PATH))
+
+def get_policy():
+    # Load the trained strategy and its bucket tables once, on first use
+    global _policy
+    if _policy is None:
+        from poker.trainer.strategy import StrategyPolicy
+        if not strategy_available():
+            raise HTTPException(status_code=503, detail="No trained strategy available")
+        _policy = StrategyPolicy.load(STRATEGY_PATH)
+    return _policy
+
+def get_session_ai():
+    # Trained strategy when one is available, otherwise the threshold AI
+    from poker.trainer.simulator import heads_up_policy, strategy_policy
+    if strategy_available():
+        return strategy_policy(get_policy())
+    from poker.trainer.game_ai import GameAI
+    return heads_up_policy(GameAI())
+
+def session_ai(game, seat):
+    # resolved on the first AI decision rather than at import
+    global _session_ai
+    if _session_ai is None:
+        _session_ai = get_session_ai()
+    return _session_ai(game, seat)
+
+sessions = SessionManager(session_ai)
+
+@app.on_event("startup")
+async def start_session_eviction():
+    asyncio.create_task(sessions.run_eviction())
+    METRICS.set("poker_startup_seconds", time.perf_counter() - _import_started, phase="ready")
+
 #include all origins for CORS
 app.add_middleware(
     CORSMiddleware,
@@ -17,11 +75,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Instrumentation ---
+# lru caches register themselves with METRICS when their module is first imported
+METRICS.describe("poker_request_seconds", "Request latency by route.")
+METRICS.describe("poker_startup_seconds", "Seconds from the start of the server import to each startup phase.")
+
+# Per-request sampling profiles are opt-in: start the server with
+# POKER_PROFILING=1 and send ?profile=1 (or an X-Profile header)
+PROFILING_ENABLED = os.environ.get("POKER_PROFILING") == "1"
+request_profiles = OrderedDict()  # profile id -> folded stacks, most recent last
+MAX_REQUEST_PROFILES = 32
+request_profiler = contextvars.ContextVar("request_profiler", default=None)
+
+def follow_profiler(endpoint):
+    # sync endpoints run in a worker thread: the request's profiler samples it meanwhile
+    @functools.wraps(endpoint)
+    def run(*args, **kwargs):
+        profiler = request_profiler.get()
+        if profiler is None:
+            return endpoint(*args, **kwargs)
+        previous = profiler.follow()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.follow(previous)
+    return run
+
+class InstrumentedRoute(APIRoute):
+    def __init__(self, path, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = follow_profiler(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+app.router.route_class = InstrumentedRoute
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    profiler = folded = None
+    if PROFILING_ENABLED and (request.query_params.get("profile") or request.headers.get("x-profile")):
+        # samples this (event loop) thread, which runs async endpoints
+        profiler = SamplingProfiler().start()
+        token = request_profiler.set(profiler)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        if profiler is not None:
+            folded = profiler.stop()
+            request_profiler.reset(token)
+    elapsed = time.perf_counter() - started
+    # one series per route template; anything unrouted shares a single label
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    METRICS.observe("poker_request_seconds", elapsed, method=request.method, path=path)
+    METRICS.inc("poker_requests_total", method=request.method, path=path, status=response.status_code)
+    if folded is not None:
+        profile_id = secrets.token_hex(6)
+        request_profiles[profile_id] = folded
+        while len(request_profiles) > MAX_REQUEST_PROFILES:
+            request_profiles.popitem(last=False)
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/profiles/{profile_id}")
+def get_request_profile(profile_id: str):
+    # folded stacks, ready for flamegraph.pl or speedscope
+    try:
+        return PlainTextResponse(request_profiles[profile_id])
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
 class EquityRequest(BaseModel):
     player_hand: str
     board_cards: str = ""
     opponent_types: List[str]
     num_simulations: int = 1000
+    seed: Optional[int] = None
+
+MAX_GRID_RUNOUTS = 5000
+
+class GridRequest(BaseModel):
+    villain_range: str  # opponent type or range notation
+    board_cards: str = ""
+    max_runouts: int = 1200
+    seed: int = 0
+
+class BotActionRequest(BaseModel):
+    hole_cards: List[str]
+    community_cards: List[str] = []
+    history: List[str] = []
+    current_bet: int = 0
+    stack_size: int = 1000
+    pot_size: int = 0
+
+class GameActionRequest(BaseModel):
+    action: str
+    amount: int = 0
 
 class LLMExplanationRequest(BaseModel):
     puzzle_id: int
@@ -30,47 +183,168 @@ class LLMExplanationRequest(BaseModel):
 
 @app.get("/puzzles/")
 def list_puzzles():
-    return [{"id": i, "question": puzzle.question} for i, puzzle in enumerate(PUZZLES)]
+    return [{"id": i, "question": puzzle.question} for i, puzzle in enumerate(puzzles.PUZZLES)]
 
 @app.get("/puzzles/{puzzle_id}")
 def get_puzzle(puzzle_id: int):
     try:
-        puzzle = PUZZLES[puzzle_id]
+        puzzle = puzzles.PUZZLES[puzzle_id]
         return puzzle
     except IndexError:
         raise HTTPException(status_code=404, detail="Puzzle not found")
 
 @app.get("/puzzles/{puzzle_id}/showdown/")
-def get_showdown(puzzle_id: int):
+def get_showdown(puzzle_id: int, seed: Optional[int] = None):
+    from poker.trainer.engine import simulate_showdown
     try:
-        puzzle = PUZZLES[puzzle_id]
+        puzzle = puzzles.PUZZLES[puzzle_id]
     except IndexError:
         raise HTTPException(status_code=404, detail="Puzzle not found")
-    showdown = simulate_showdown(
-        puzzle.player_hand,
-        puzzle.board_cards,
-        [op.type for op in puzzle.opponents]
-    )
+    try:
+        showdown = simulate_showdown(
+            puzzle.player_hand,
+            puzzle.board_cards,
+            [op.type for op in puzzle.opponents],
+            seed=seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return showdown
 
+@app.get("/puzzles/{puzzle_id}/outs/")
+def get_outs(puzzle_id: int):
+    from poker.trainer.outs import analyze_puzzle_outs
+    try:
+        puzzle = puzzles.PUZZLES[puzzle_id]
+    except IndexError:
+        raise HTTPException(status_code=404, detail="Puzzle not found")
+    try:
+        return analyze_puzzle_outs(puzzle)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/puzzles/{puzzle_id}/grade/")
+def get_grade(puzzle_id: int):
+    # EV of fold / call / raise; cached per puzzle by the grader
+    from poker.trainer.grading import grade_puzzle
+    try:
+        puzzle = puzzles.PUZZLES[puzzle_id]
+    except IndexError:
+        raise HTTPException(status_code=404, detail="Puzzle not found")
+    try:
+        return grade_puzzle(puzzle)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/equity/")
 def calculate_equity(req: EquityRequest):
-    result = calculate_multi_way_equity(
-        req.player_hand,
-        req.board_cards,
-        req.opponent_types,
-        req.num_simulations
-    )
+    from poker.trainer.engine import calculate_multi_way_equity
+    try:
+        result = calculate_multi_way_equity(
+            req.player_hand,
+            req.board_cards,
+            req.opponent_types,
+            req.num_simulations,
+            seed=req.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
+@app.post("/equity/grid/")
+def get_equity_grid(req: GridRequest):
+    # 13x13 class equity chart; cached per board texture by the grid module
+    from poker.trainer.hand_grid import equity_grid
+    if not 1 <= req.max_runouts <= MAX_GRID_RUNOUTS:
+        raise HTTPException(status_code=400, detail=f"max_runouts must be between 1 and {MAX_GRID_RUNOUTS}")
+    try:
+        return equity_grid(req.villain_range, req.board_cards, req.max_runouts, req.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/profiles/")
+def list_profiles():
+    from poker.trainer.engine import PROFILES
+    return [{"name": name, "combos": len(PROFILES.get(name))} for name in PROFILES.names()]
+
+@app.post("/bot/action/")
+def bot_action(req: BotActionRequest):
+    policy = get_policy()
+    try:
+        return policy.get_action(
+            req.hole_cards,
+            req.community_cards,
+            req.history,
+            req.current_bet,
+            req.stack_size,
+            req.pot_size
+        )
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/games/")
+async def create_game():
+    try:
+        session, events = await sessions.create()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return session.view(events)
+
+def get_session(game_id: str):
+    try:
+        return sessions.get(game_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+@app.get("/games/{game_id}")
+async def get_game(game_id: str):
+    return get_session(game_id).view()
+
+@app.post("/games/{game_id}/action")
+async def game_action(game_id: str, req: GameActionRequest):
+    session = get_session(game_id)
+    try:
+        events = await sessions.act(game_id, req.action, req.amount)
+    except KeyError:
+        # evicted since get_session
+        raise HTTPException(status_code=404, detail="Game not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.view(events)
+
+@app.post("/games/{game_id}/next")
+async def next_hand(game_id: str):
+    session = get_session(game_id)
+    try:
+        events = await sessions.next_hand(game_id)
+    except KeyError:
+        # evicted since get_session
+        raise HTTPException(status_code=404, detail="Game not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.view(events)
+
+@app.delete("/games/{game_id}")
+async def close_game(game_id: str):
+    get_session(game_id)
+    sessions.close(game_id)
+    return {"closed": game_id}
+
 @app.post("/llm/explanation/")
 def llm_explanation(req: LLMExplanationRequest):
+    from poker.trainer.engine import calculate_multi_way_equity
+    from poker.trainer.llm import get_llm_explanation
     try:
-        puzzle = PUZZLES[req.puzzle_id]
+        puzzle = puzzles.PUZZLES[req.puzzle_id]
     except IndexError:
         raise HTTPException(status_code=404, detail="Puzzle not found")
-    equity_result = calculate_multi_way_equity(
-        puzzle.player_hand, puzzle.board_cards, [op.type for op in puzzle.opponents], 1000
-    )
+    try:
+        equity_result = calculate_multi_way_equity(
+            puzzle.player_hand, puzzle.board_cards, [op.type for op in puzzle.opponents], 1000
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     explanation = get_llm_explanation(puzzle, req.user_action, req.correct_action, equity_result)
-    return {"explanation": explanation} 
\ No newline at end of file
+    return {"explanation": explanation} 
+
+METRICS.set("poker_startup_seconds", time.perf_counter() - _import_started, phase="import")
@@ -0,0 +1,147 @@
+# poker/server/sessions.py
+"""
+Server-hosted heads-up game sessions.
+
+One `SessionManager` holds every live game in the process. A session is a
+HeadsUpGame plus a few slots of bookkeeping, so thousands fit comfortably in
+memory; sessions idle for longer than `idle_timeout` seconds are evicted.
+The human always sits in seat 0. After each human action the AI's replies
+are computed in a worker thread so the event loop keeps serving other
+tables while a policy thinks.
+"""
+import asyncio
+import secrets
+import time
+
+from poker.trainer.heads_up_game import HeadsUpGame
+
+HUMAN, AI = 0, 1
+
+
+class Session:
+    __slots__ = ('id', 'game', 'lock', 'last_active', 'hands_played', 'revealed', 'starting_stack')
+
+    def __init__(self, session_id, game, starting_stack):
+        self.id = session_id
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+        self.hands_played = 0
+        self.revealed = False  # AI cards are shown once a hand reaches showdown
+        self.starting_stack = starting_stack
+
+    def view(self, events=()):
+        """State as the human player sees it."""
+        game = self.game
+        return {
+            "session_id": self.id,
+            "hands_played": self.hands_played,
+            "street": game.street,
+            "your_cards": game.hole_card_strings(HUMAN),
+            "ai_cards": game.hole_card_strings(AI) if self.revealed else [],
+            "board": game.board_strings(),
+            "pot": game.pot,
+            "your_stack": game.stacks[HUMAN],
+            "ai_stack": game.stacks[AI],
+            "to_call": game.to_call(HUMAN) if game.to_act == HUMAN else 0,
+            "your_turn": game.to_act == HUMAN,
+            "legal_actions": game.legal_actions() if game.to_act == HUMAN else [],
+            "hand_over": game.hand_over,
+            "winner": {HUMAN: "player", AI: "ai", None: "tie"}[game.winner] if game.hand_over else None,
+            "events": list(events),
+        }
+
+
+class SessionManager:
+    def __init__(self, policy, max_sessions=10000, idle_timeout=900,
+                 starting_stack=1000, small_blind=5, big_blind=10):
+        """`policy(game, seat) -> {'action', 'amount'}` plays the AI seat (see poker.trainer.simulator)."""
+        self.policy = policy
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.starting_stack = starting_stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.sessions = {}
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def get(self, session_id):
+        session = self.sessions[session_id]
+        session.last_active = time.monotonic()
+        return session
+
+    async def create(self):
+        if len(self.sessions) >= self.max_sessions and not self.evict_idle():
+            raise RuntimeError("Too many active game sessions.")
+        game = HeadsUpGame(
+            stacks=(self.starting_stack, self.starting_stack),
+            small_blind=self.small_blind, big_blind=self.big_blind
+        )
+        session = Session(secrets.token_hex(8), game, self.starting_stack)
+        self.sessions[session.id] = session
+        return session, await self.next_hand(session.id)
+
+    def close(self, session_id):
+        del self.sessions[session_id]
+
+    async def next_hand(self, session_id):
+        """Starts the session's next hand; the button alternates between hands."""
+        session = self.get(session_id)
+        async with session.lock:
+            game = session.game
+            if not game.hand_over:
+                raise ValueError("The current hand is not finished.")
+            if min(game.stacks) <= 0:
+                game.stacks = [session.starting_stack, session.starting_stack]
+            session.revealed = False
+            events = game.start_hand(button=session.hands_played % 2)
+            session.hands_played += 1
+            if game.to_act == AI:
+                events += await asyncio.to_thread(self._play_ai, session)
+            return events
+
+    async def act(self, session_id, action, amount=0):
+        """Applies the human's action, then lets the AI respond until it is the human's turn again."""
+        session = self.get(session_id)
+        async with session.lock:
+            game = session.game
+            if game.hand_over or game.to_act != HUMAN:
+                raise ValueError("It is not your turn.")
+            events = game.apply_action(action, amount)
+            self._note_showdown(session, events)
+            if not game.hand_over and game.to_act == AI:
+                events += await asyncio.to_thread(self._play_ai, session)
+            return events
+
+    def _play_ai(self, session):
+        game = session.game
+        events = []
+        while not game.hand_over and game.to_act == AI:
+            decision = self.policy(game, AI)
+            try:
+                new_events = game.apply_action(decision['action'], decision.get('amount', 0))
+            except ValueError:
+                new_events = game.apply_action('call')
+            events += new_events
+        self._note_showdown(session, events)
+        return events
+
+    @staticmethod
+    def _note_showdown(session, events):
+        if any(event['type'] == 'showdown' for event in events):
+            session.revealed = True
+
+    def evict_idle(self, now=None):
+        """Drops sessions idle for longer than idle_timeout; returns how many were evicted."""
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_timeout
+        stale = [sid for sid, session in self.sessions.items() if session.last_active < cutoff]
+        for sid in stale:
+            del self.sessions[sid]
+        return len(stale)
+
+    async def run_eviction(self, interval=60):
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
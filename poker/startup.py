@@ -0,0 +1,84 @@
+# poker/startup.py
+"""
+Cold-start report: how long importing each entry point takes in a fresh
+interpreter, and which modules account for it.
+
+Every target is imported in its own subprocess under `python -X importtime`,
+so nothing is warm from an earlier import. The report lists the total and
+the modules with the largest self time, which is where deferring an import
+pays off. A running server also reports `poker_startup_seconds` on /metrics.
+
+Usage:
+    python -m poker.startup
+    python -m poker.startup poker.server.main poker.trainer.engine --top 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# The server entry point, then the subsystems it loads on first use
+DEFAULT_TARGETS = (
+    'poker.server.main',
+    'poker.trainer.engine',
+    'poker.trainer.grading',
+    'poker.trainer.outs',
+    'poker.trainer.hand_grid',
+    'poker.trainer.llm',
+    'poker.trainer.strategy',
+)
+
+
+def import_profile(module):
+    """(total seconds, [(module, self seconds, cumulative seconds)]) of importing `module` from scratch."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"cannot import {module}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    total = next((cumulative for name, _, cumulative in reversed(rows) if name == module), 0.0)
+    return total, rows
+
+
+def startup_report(targets=DEFAULT_TARGETS, top=10):
+    report = {}
+    for module in targets:
+        try:
+            total, rows = import_profile(module)
+        except RuntimeError as e:
+            report[module] = {"error": str(e)}
+            continue
+        rows.sort(key=lambda row: row[1], reverse=True)
+        report[module] = {
+            "import_seconds": total,
+            "slowest": [{"module": name, "self_seconds": s, "cumulative_seconds": c} for name, s, c in rows[:top]],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time report for the server and its subsystems")
+    parser.add_argument("targets", nargs="*", help=f"modules to import (default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list per target")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = startup_report(args.targets or DEFAULT_TARGETS, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+    for module, result in report.items():
+        if "error" in result:
+            print(f"{module}: failed ({result['error']})")
+            continue
+        print(f"{module}: {result['import_seconds'] * 1000:.1f} ms")
+        for row in result["slowest"]:
+            print(f"    {row['self_seconds'] * 1000:8.1f} ms self  {row['cumulative_seconds'] * 1000:8.1f} ms total  "
+                  f"{row['module']}")
@@ -0,0 +1,343 @@
+# poker/trainer/abstraction.py
+"""
+Equity-based card abstraction.
+
+Hands are clustered into N buckets per street by their equity distribution
+against a random opponent hand: E[HS] (expected hand strength at the river)
+or E[HS^2] (which also rewards drawing potential).
+
+Buckets are computed offline into flat per-street tables indexed by the
+suit-isomorphic hand index of hole cards + board (`build`, hours of CPU for
+the turn and river) and saved to one file. Loading maps the file read-only,
+so a lookup is an O(1) read, the OS only pages in the parts of the 123 MB
+river table that are touched and every worker on the machine shares them.
+Without tables, buckets are computed on first lookup and kept in a dict,
+which is enough for training on a sample of hands but too slow to serve.
+"""
+import json
+import mmap
+import os
+import random
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+
+from poker.trainer.evaluator import FULL_DECK, RANK_BIT, evaluate, evaluate_masks
+from poker.trainer.isomorphism import HandIndexer, street_indexer
+
+STREETS = {0: 'preflop', 3: 'flop', 4: 'turn', 5: 'river'}
+SETTINGS = (
+    'num_buckets', 'metric', 'rollouts', 'opponent_samples',
+    'preflop_rollouts', 'calibration_samples', 'seed'
+)
+
+# Bucket table file: header, JSON settings and cuts, then the table of every
+# street in STREETS order, one byte per isomorphic hand
+_MAGIC = b'PKAB'
+_FORMAT = 1
+_HEADER = struct.Struct('<4sHI')
+
+
+# --- Hand strength ---
+def river_hand_strength(hole_cards, board_cards):
+    """Exact share of opponent holdings beaten (ties count half) on a complete board."""
+    dead = set(hole_cards) | set(board_cards)
+    deck = [c for c in FULL_DECK if c not in dead]
+    board = list(board_cards)
+    hero = evaluate(board + list(hole_cards))
+    wins = ties = total = 0
+    for i in range(len(deck)):
+        a = deck[i]
+        for b in deck[i + 1:]:
+            villain = evaluate(board + [a, b])
+            if hero > villain:
+                wins += 1
+            elif hero == villain:
+                ties += 1
+            total += 1
+    return (wins + ties / 2) / total
+
+
+def river_strengths(board_cards):
+    """
+    {(a, b): river_hand_strength((a, b), board_cards)} for every holding on
+    a complete board, from one evaluation per holding: the hands beaten are
+    all those beaten, less the ones that share a card with the holding.
+    """
+    board = list(board_cards)
+    deck = [c for c in FULL_DECK if c not in board]
+    masks = [0, 0, 0, 0]
+    for c in board:
+        masks[c & 3] |= RANK_BIT[c]
+    scores = {}
+    by_card = {c: [] for c in deck}
+    for i, a in enumerate(deck):
+        for b in deck[i + 1:]:
+            hand = masks[:]
+            hand[a & 3] |= RANK_BIT[a]
+            hand[b & 3] |= RANK_BIT[b]
+            score = scores[a, b] = evaluate_masks(*hand)
+            by_card[a].append(score)
+            by_card[b].append(score)
+    every = sorted(scores.values())
+    for card_scores in by_card.values():
+        card_scores.sort()
+    # holdings disjoint from (a, b): all, less those holding a or b, plus (a, b) itself
+    total = len(every) - 2 * (len(deck) - 1) + 1
+    strengths = {}
+    for (a, b), score in scores.items():
+        wins = ties = 0
+        for sign, sorted_scores in ((1, every), (-1, by_card[a]), (-1, by_card[b])):
+            below = bisect_left(sorted_scores, score)
+            wins += sign * below
+            ties += sign * (bisect_right(sorted_scores, score) - below)
+        # (a, b) itself was taken out twice
+        strengths[a, b] = (wins + (ties + 1) / 2) / total
+    return strengths
+
+
+def equity_moments(hole_cards, board_cards, rollouts=64, opponent_samples=24, rng=random):
+    """
+    Returns (E[HS], E[HS^2]) where HS is the river hand strength against a
+    random opponent hand, averaged over random runouts of the board.
+    """
+    missing = 5 - len(board_cards)
+    if missing == 0:
+        hs = river_hand_strength(hole_cards, board_cards)
+        return hs, hs * hs
+
+    dead = set(hole_cards) | set(board_cards)
+    deck = [c for c in FULL_DECK if c not in dead]
+    hole = list(hole_cards)
+    rand = rng.random
+    total = total_sq = 0.0
+    for _ in range(rollouts):
+        runout = rng.sample(deck, missing)
+        board = list(board_cards) + runout
+        masks = [0, 0, 0, 0]
+        for c in board:
+            masks[c & 3] |= RANK_BIT[c]
+        rest = [c for c in deck if c not in runout]
+        n = len(rest)
+        hero = evaluate(board + hole)
+        score = 0.0
+        for _ in range(opponent_samples):
+            i = int(rand() * n)
+            j = int(rand() * (n - 1))
+            if j >= i:
+                j += 1
+            a, b = rest[i], rest[j]
+            villain = masks[:]
+            villain[a & 3] |= RANK_BIT[a]
+            villain[b & 3] |= RANK_BIT[b]
+            villain = evaluate_masks(*villain)
+            if hero > villain:
+                score += 1
+            elif hero == villain:
+                score += 0.5
+        hs = score / opponent_samples
+        total += hs
+        total_sq += hs * hs
+    return total / rollouts, total_sq / rollouts
+
+
+# --- Offline table building ---
+def _street_chunk(args):
+    settings, board_size, cuts, start, stop = args
+    abstraction = CardAbstraction(**settings)
+    return bytes(bisect_right(cuts, abstraction._metric(board_size, index)) for index in range(start, stop))
+
+
+def _river_chunk(args):
+    # every river hand is a suit relabelling of some holding on a canonical board
+    metric, cuts, start, stop = args
+    boards, indexer = HandIndexer((5,)), street_indexer(5)
+    indices, buckets = array('I'), bytearray()
+    for board_index in range(start, stop):
+        board = boards.unindex(0, board_index)
+        for (a, b), hs in river_strengths(board).items():
+            indices.append(indexer.index([a, b] + board))
+            buckets.append(bisect_right(cuts, hs * hs if metric == 'ehs2' else hs))
+    return indices, bytes(buckets)
+
+
+# --- Abstraction ---
+class CardAbstraction:
+    """
+    Maps (hole cards, board) to an equity bucket in 0..num_buckets-1.
+
+    Bucket boundaries for each street are percentiles of the chosen metric
+    ('ehs' or 'ehs2') over a calibration sample of random deals. A street
+    with a complete table (one byte per isomorphic hand, from `build` or
+    `load`) is served from it; other streets compute a hand's bucket on its
+    first lookup. Results only depend on `seed` and the hand index, never
+    on call order, so tables built offline match the buckets CFR trained on.
+    """
+
+    def __init__(self, num_buckets=10, metric='ehs2', rollouts=64, opponent_samples=24,
+                 preflop_rollouts=400, calibration_samples=200, seed=0):
+        if metric not in ('ehs', 'ehs2'):
+            raise ValueError(f"Unknown abstraction metric: {metric}")
+        if isinstance(num_buckets, int):
+            num_buckets = {street: num_buckets for street in STREETS.values()}
+        if not all(0 < n < 256 for n in num_buckets.values()):
+            raise ValueError("Bucket counts must be between 1 and 255.")
+        self.num_buckets = dict(num_buckets)
+        self.metric = metric
+        self.rollouts = rollouts
+        self.preflop_rollouts = preflop_rollouts
+        self.opponent_samples = opponent_samples
+        self.calibration_samples = calibration_samples
+        self.seed = seed
+        self.cuts = {}
+        self.tables = {}
+        self._computed = {}
+
+    def settings(self):
+        return {name: getattr(self, name) for name in SETTINGS}
+
+    def bucket(self, hole_cards, board_cards=()):
+        board_size = len(board_cards)
+        index = street_indexer(board_size).index(list(hole_cards) + list(board_cards))
+        return self.bucket_at(board_size, index)
+
+    def bucket_at(self, board_size, index):
+        """Bucket of the hand with isomorphic index `index` on a board of `board_size` cards."""
+        table = self.tables.get(board_size)
+        if table is not None:
+            return table[index]
+        # no table: computed once per hand, memory grows with the hands seen
+        computed = self._computed.setdefault(board_size, {})
+        bucket = computed.get(index)
+        if bucket is None:
+            bucket = computed[index] = bisect_right(self._cuts(board_size), self._metric(board_size, index))
+        return bucket
+
+    def build(self, processes=1):
+        """Builds the complete table of every street (see `build_table`)."""
+        for board_size in STREETS:
+            self.build_table(board_size, processes)
+
+    def build_table(self, board_size, processes=1, chunk_size=4096):
+        """
+        Computes the bucket of every isomorphic hand of a street, split over
+        `processes` worker processes. Preflop takes seconds, the flop about
+        an hour of CPU and the turn and river several hours each, so this
+        runs offline and the result is saved with `save`.
+        """
+        cuts = self._cuts(board_size)
+        if board_size == 0:
+            return
+        if board_size == 5:
+            # one evaluation pass per canonical board covers all 1081 of its holdings
+            size = HandIndexer((5,)).size()
+            boards = max(1, chunk_size // 1081)
+            chunks = [(self.metric, cuts, start, min(start + boards, size)) for start in range(0, size, boards)]
+            worker = _river_chunk
+        else:
+            size = street_indexer(board_size).size()
+            settings = self.settings()
+            chunks = [(settings, board_size, cuts, start, min(start + chunk_size, size))
+                      for start in range(0, size, chunk_size)]
+            worker = _street_chunk
+
+        table = bytearray(street_indexer(board_size).size())
+        if processes > 1:
+            from multiprocessing import Pool
+            with Pool(processes) as pool:
+                results = list(pool.imap(worker, chunks))
+        else:
+            results = [worker(chunk) for chunk in chunks]
+        for chunk, result in zip(chunks, results):
+            if board_size == 5:
+                for index, bucket in zip(*result):
+                    table[index] = bucket
+            else:
+                table[chunk[-2]:chunk[-1]] = result
+        self.tables[board_size] = table
+        self._computed.pop(board_size, None)
+
+    def _cuts(self, board_size):
+        cuts = self.cuts.get(board_size)
+        if cuts is None:
+            cuts = self.cuts[board_size] = self._calibrate(board_size)
+        return cuts
+
+    def _metric(self, board_size, index):
+        cards = street_indexer(board_size).unindex(1 if board_size else 0, index)
+        rng = random.Random(hash((self.seed, board_size, index)))
+        rollouts = self.rollouts if board_size else self.preflop_rollouts
+        ehs, ehs2 = equity_moments(cards[:2], cards[2:], rollouts, self.opponent_samples, rng)
+        return ehs2 if self.metric == 'ehs2' else ehs
+
+    def _calibrate(self, board_size):
+        indexer = street_indexer(board_size)
+        if board_size == 0:
+            # all 169 starting hands, weighted by their number of combos;
+            # the preflop table is built as a by-product
+            metrics = [self._metric(0, index) for index in range(indexer.size())]
+            values = []
+            for index, metric in enumerate(metrics):
+                a, b = indexer.unindex(0, index)
+                values.extend([metric] * (6 if a >> 2 == b >> 2 else 4 if a & 3 == b & 3 else 12))
+            values.sort()
+            n = self.num_buckets['preflop']
+            cuts = [values[len(values) * k // n] for k in range(1, n)]
+            self.tables[0] = bytes(bisect_right(cuts, metric) for metric in metrics)
+            return cuts
+
+        rng = random.Random(hash((self.seed, board_size)))
+        values = []
+        for _ in range(self.calibration_samples):
+            cards = rng.sample(FULL_DECK, 2 + board_size)
+            values.append(self._metric(board_size, indexer.index(cards)))
+        values.sort()
+        n = self.num_buckets[STREETS[board_size]]
+        return [values[len(values) * k // n] for k in range(1, n)]
+
+    # --- Persistence ---
+    def save(self, path):
+        """Writes the settings, cuts and tables to `path`; every street's table must be built."""
+        missing = [name for board_size, name in STREETS.items() if board_size not in self.tables]
+        if missing:
+            raise ValueError(f"No bucket tables for: {', '.join(missing)}")
+        meta = json.dumps({
+            'settings': self.settings(),
+            'cuts': {str(board_size): cuts for board_size, cuts in self.cuts.items()},
+        }).encode()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _FORMAT, len(meta)))
+                f.write(meta)
+                for board_size in STREETS:
+                    f.write(self.tables[board_size])
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """An abstraction serving every street from the tables in `path`; raises ValueError if it is not a table file."""
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, length = _HEADER.unpack_from(buf, 0)
+            if magic != _MAGIC or version != _FORMAT:
+                raise ValueError(f"Not a version {_FORMAT} bucket table file: {path}")
+            meta = json.loads(buf[_HEADER.size:_HEADER.size + length])
+            abstraction = cls(**meta['settings'])
+            abstraction.cuts = {int(board_size): cuts for board_size, cuts in meta['cuts'].items()}
+        except (struct.error, KeyError, TypeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt bucket table file: {path}") from e
+        view = memoryview(buf)
+        offset = _HEADER.size + length
+        for board_size in STREETS:
+            size = street_indexer(board_size).size()
+            abstraction.tables[board_size] = view[offset:offset + size]
+            offset += size
+        if offset != len(buf):
+            raise ValueError(f"Corrupt bucket table file: {path}")
+        return abstraction
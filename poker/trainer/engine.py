@@ -1,10 +1,16 @@
 # poker/engine.py
 
+import os
 import random
-from poker.trainer.models import Card, Deck
-from poker.trainer.utils import (
-    parse_hand_string, get_hand_rank_and_kickers, get_hand_permutations
+import time
+from poker.metrics import METRICS
+from poker.trainer.evaluator import (
+    CATEGORY_SHIFT, HAND_NAMES, evaluate, cards_from_str, cards_to_str
 )
+from poker.trainer.equity import ReusableDeck, card_mask
+from poker.trainer.ranges import COMBOS, COMBO_MASKS, NUM_COMBOS, combo_index, parse_range
+from poker.trainer.range_equity import range_vs_range
+from poker.trainer.profiles import ProfileRegistry
 
 # --- Opponent ranges (simplified) ---
 OPPONENT_RANGES = {
@@ -33,90 +39,217 @@ OPPONENT_RANGES = {
     ]
 }
 
-# Pre-process ranges into actual Card objects for efficiency later
-PREPROCESSED_OPPONENT_RANGES = {}
-for player_type, hand_strings in OPPONENT_RANGES.items():
-    all_possible_hands_for_type = []
-    for hs in hand_strings:
-        all_possible_hands_for_type.extend(get_hand_permutations(hs))
-    PREPROCESSED_OPPONENT_RANGES[player_type] = all_possible_hands_for_type
+# Built-in profiles plus any defined in *.json files in the profile directory,
+# compiled once and picked up without a restart when the files change. The
+# compiled ranges are cached on disk in the user's cache directory, so that
+# user's workers start without parsing them (each still keeps its own copy in
+# memory); the artifacts are trusted when loaded, so the directory must not be
+# writable by anyone else
+PROFILES_DIR = os.environ.get("POKER_PROFILES_DIR", "opponent_profiles")
+RANGE_CACHE_DIR = os.environ.get("POKER_RANGE_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "poker-trainer", "ranges"
+)
+PROFILES = ProfileRegistry(OPPONENT_RANGES, PROFILES_DIR, cache_dir=RANGE_CACHE_DIR)
 
 # --- Main equity calculation function ---
 
 
-def calculate_multi_way_equity(player_hand_str, board_cards_str="", opponent_types=[], num_simulations=1000):
-    player_hand = parse_hand_string(player_hand_str)
-    board_cards = parse_hand_string(board_cards_str)
+def _deal_opponents(opponent_ranges, known_mask, rng):
+    """
+    One hand per opponent, drawn by weight from its range around the cards
+    already out; an opponent whose whole range is blocked gets None and is
+    dealt random cards. Returns (hands, dead card mask).
+    """
+    dead = known_mask
+    opp_hands = []
+    for compiled in opponent_ranges:
+        combo = compiled.sample(dead, rng)
+        if combo is None:
+            opp_hands.append(None)
+        else:
+            opp_hands.append(list(COMBOS[combo]))
+            dead |= COMBO_MASKS[combo]
+    return opp_hands, dead
+
+
+def _deal_rest(opp_hands, board_cards, deck):
+    # random cards for range-less opponents and the rest of the board, from a
+    # deck that excludes the known cards and is reset here for each trial
+    deck.reset()
+    need = 5 - len(board_cards)
+    for hand in opp_hands:
+        if hand is None:
+            need += 2
+        else:
+            deck.remove(hand[0])
+            deck.remove(hand[1])
+    dealt = deck.deal(need)
+    for k, hand in enumerate(opp_hands):
+        if hand is None:
+            opp_hands[k] = [dealt.pop(), dealt.pop()]
+    return board_cards + dealt
+
+
+def calculate_multi_way_equity(player_hand_str, board_cards_str="", opponent_types=[], num_simulations=1000,
+                               detailed=False, seed=None, rng=random):
+    """
+    Monte Carlo equity of the player's hand against one opponent per entry
+    of `opponent_types`, each holding a hand from that profile's range.
+
+    Win and tie percentages count outright wins and shared best hands; the
+    equity percentages are pot shares, where a three-way tie is worth a
+    third to each of the three. The player's and every opponent's equity
+    ("opponent_equity_breakdown") add up to 100.
+
+    With `detailed`, the same simulations also yield:
+    - "player_specific_hand_odds": how often the player ends with each hand
+      category, in percent.
+    - "equity_distribution": for each opponent, every hand it was dealt with
+      how often (percent of simulations) and the player's pot share against it.
+
+    Deals come from `rng`; with a `seed` they come from a fresh
+    random.Random(seed) instead, so the same call returns the same result.
+    """
+    if seed is not None:
+        rng = random.Random(seed)
+    with METRICS.timer('equity.setup'):
+        player_hand = cards_from_str(player_hand_str)
+        board_cards = cards_from_str(board_cards_str)
+        opponent_ranges = [PROFILES.get(op_type) for op_type in opponent_types]
+        known = card_mask(player_hand) | card_mask(board_cards)
+        deck = ReusableDeck(known, rng)
+    started = time.perf_counter()
     player_win = tie = opponent_win = 0
+    player_share = 0.0
+    opp_wins = [0] * len(opponent_types)
+    opp_ties = [0] * len(opponent_types)
+    opp_shares = [0.0] * len(opponent_types)
+    if detailed:
+        category_counts = [0] * 10
+        combo_counts = [[0] * NUM_COMBOS for _ in opponent_types]
+        combo_shares = [[0.0] * NUM_COMBOS for _ in opponent_types]
 
     for _ in range(num_simulations):
-        deck = Deck()
-        deck.remove_cards(player_hand + board_cards)
-
-        opp_hands = []
-        for op_type in opponent_types:
-            available_hands = [h for h in PREPROCESSED_OPPONENT_RANGES[op_type]
-                               if h[0] in deck.cards and h[1] in deck.cards]
-            if available_hands:
-                hand = random.choice(available_hands)
-                opp_hands.append(hand)
-                deck.remove_cards(hand)
-            else:
-                opp_hands.append(deck.deal(2))
-
-        community = board_cards + deck.deal(5 - len(board_cards))
-        player_final = player_hand + community
-        player_rank = get_hand_rank_and_kickers(player_final)
+        opp_hands, _ = _deal_opponents(opponent_ranges, known, rng)
+        community = _deal_rest(opp_hands, board_cards, deck)
+        player_rank = evaluate(player_hand + community)
 
         opp_ranks = []
         for hand in opp_hands:
-            opp_final = hand + community
-            opp_ranks.append(get_hand_rank_and_kickers(opp_final))
+            opp_ranks.append(evaluate(hand + community))
 
         all_ranks = [player_rank] + opp_ranks
         best = max(all_ranks)
-
-        if all_ranks.count(best) > 1:
-            tie += 1
-        elif best == player_rank:
-            player_win += 1
+        winners = all_ranks.count(best)
+        share = 1.0 / winners
+
+        # the pot is split evenly between everyone holding the best hand
+        if player_rank == best:
+            player_share += share
+            if winners > 1:
+                tie += 1
+            else:
+                player_win += 1
         else:
             opponent_win += 1
-
+        for k, rank in enumerate(opp_ranks):
+            if rank == best:
+                opp_shares[k] += share
+                if winners > 1:
+                    opp_ties[k] += 1
+                else:
+                    opp_wins[k] += 1
+
+        if detailed:
+            category_counts[player_rank >> CATEGORY_SHIFT] += 1
+            share = share if player_rank == best else 0.0
+            for k, hand in enumerate(opp_hands):
+                combo = combo_index(hand[0], hand[1])
+                combo_counts[k][combo] += 1
+                combo_shares[k][combo] += share
+
+    elapsed = time.perf_counter() - started
+    METRICS.stage('equity.simulate', elapsed)
+    METRICS.inc('poker_equity_simulations_total', num_simulations)
+    if elapsed > 0:
+        METRICS.set('poker_equity_simulations_per_second', num_simulations / elapsed)
+
+    started = time.perf_counter()
     total = player_win + tie + opponent_win
-    return {
+    result = {
         "player_win_percentage": player_win / total * 100,
         "tie_percentage": tie / total * 100,
         "opponent_win_percentage": opponent_win / total * 100,
+        "player_equity_percentage": player_share / total * 100,
+        "opponent_equity_breakdown": {
+            f"Opponent {k+1} ({op_type})": {
+                "win_percentage": opp_wins[k] / total * 100,
+                "tie_percentage": opp_ties[k] / total * 100,
+                "equity_percentage": opp_shares[k] / total * 100,
+            }
+            for k, op_type in enumerate(opponent_types)
+        },
     }
-
-def simulate_showdown(player_hand_str, board_cards_str="", opponent_types=[]):
+    if detailed:
+        result["player_specific_hand_odds"] = {
+            HAND_NAMES[category]: category_counts[category] / total * 100 for category in range(9, 0, -1)
+        }
+        result["equity_distribution"] = []
+        for counts, shares in zip(combo_counts, combo_shares):
+            hands = [
+                {
+                    "hand": cards_to_str(COMBOS[combo]),
+                    "frequency": counts[combo] / total * 100,
+                    "equity": shares[combo] / counts[combo] * 100,
+                }
+                for combo in range(NUM_COMBOS) if counts[combo]
+            ]
+            hands.sort(key=lambda h: h["equity"], reverse=True)
+            result["equity_distribution"].append(hands)
+    METRICS.stage('equity.summarize', time.perf_counter() - started)
+    return result
+
+def simulate_showdown(player_hand_str, board_cards_str="", opponent_types=[], seed=None, rng=random):
     """
     Simulate a single showdown: returns dict with player_hand, board, and each opponent's hand.
+    A `seed` makes the deal reproducible.
     """
-    player_hand = parse_hand_string(player_hand_str)
-    board_cards = parse_hand_string(board_cards_str)
-    deck = Deck()
-    deck.remove_cards(player_hand + board_cards)
-
-    opp_hands = []
-    for op_type in opponent_types:
-        available_hands = [h for h in PREPROCESSED_OPPONENT_RANGES[op_type]
-                           if h[0] in deck.cards and h[1] in deck.cards]
-        if available_hands:
-            hand = random.choice(available_hands)
-            opp_hands.append(hand)
-            deck.remove_cards(hand)
-        else:
-            opp_hands.append(deck.deal(2))
+    if seed is not None:
+        rng = random.Random(seed)
+    player_hand = cards_from_str(player_hand_str)
+    board_cards = cards_from_str(board_cards_str)
+    opponent_ranges = [PROFILES.get(op_type) for op_type in opponent_types]
+    known = card_mask(player_hand) | card_mask(board_cards)
 
-    community = board_cards + deck.deal(5 - len(board_cards))
-    # Convert Card objects to string for serialization
-    def cards_to_str(cards):
-        return ''.join(str(card) for card in cards)
+    opp_hands, _ = _deal_opponents(opponent_ranges, known, rng)
+    community = _deal_rest(opp_hands, board_cards, ReusableDeck(known, rng))
 
     return {
         "player_hand": cards_to_str(player_hand),
         "board": cards_to_str(community),
         "opponents": [cards_to_str(hand) for hand in opp_hands],
-    }
\ No newline at end of file
+    }
+
+def _range_weights(hand_range):
+    # an opponent type name, range notation, a list of hand classes, or a weight vector
+    if isinstance(hand_range, str):
+        if hand_range in PROFILES:
+            return PROFILES.get(hand_range).weights
+        return parse_range(hand_range).weights
+    if len(hand_range) == NUM_COMBOS and not isinstance(hand_range[0], str):
+        return hand_range
+    return parse_range(','.join(hand_range)).weights
+
+def calculate_range_equity(hero_range, villain_range, board_cards_str="", max_runouts=1200, seed=None, rng=random):
+    """
+    Range-vs-range equity on a board. Each range is an opponent type
+    ('tight', 'standard', ...), range notation like '22+, ATs+, AKo:0.5',
+    a list of hand classes like ['AA', 'AKs'], or a 1326-entry weight vector.
+    A `seed` fixes the runouts sampled when there are more than `max_runouts`.
+    """
+    if seed is not None:
+        rng = random.Random(seed)
+    return range_vs_range(
+        _range_weights(hero_range), _range_weights(villain_range),
+        cards_from_str(board_cards_str), max_runouts, rng
+    )
@@ -0,0 +1,138 @@
+# poker/trainer/equity.py
+"""
+Fast Monte Carlo equity on integer cards (see poker.trainer.evaluator).
+
+The known cards are folded into a dead-card mask and per-suit rank masks
+once per call. Each trial then reshuffles only the cards it needs, in place,
+in one reused deck list (partial Fisher-Yates), and scores hands by OR-ing
+the dealt cards into the precomputed board masks. Pots won jointly are
+split: a three-way tie for the best hand is worth a third to each player.
+"""
+import random
+
+from poker.trainer.evaluator import FULL_DECK, RANK_BIT, evaluate_masks
+
+
+def card_mask(cards):
+    """52-bit mask with one bit per card."""
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+def suit_masks(cards):
+    masks = [0, 0, 0, 0]
+    for c in cards:
+        masks[c & 3] |= RANK_BIT[c]
+    return masks
+
+
+class ReusableDeck:
+    """
+    An integer-card deck built once and reused for every trial.
+
+    `cards` is one preallocated list: live cards first, then the cards
+    excluded with `dead_mask`. `deal(k)` swaps k random live cards to the
+    front (partial Fisher-Yates, O(k)), `remove(card)` swaps one live card
+    behind the live section (O(1), through the `position` index) and
+    `reset()` returns every dealt and removed card in O(1). Dealing from any
+    order of the live cards is uniform, so a reset deck is never reshuffled.
+    """
+    __slots__ = ('cards', 'position', 'live', 'size', 'top', 'rng')
+
+    def __init__(self, dead_mask=0, rng=random):
+        self.cards = list(FULL_DECK)
+        self.position = list(FULL_DECK)
+        self.rng = rng
+        self.exclude(dead_mask)
+
+    def exclude(self, dead_mask):
+        """Leaves out the cards in `dead_mask` until the next `exclude`, and resets."""
+        live = [c for c in FULL_DECK if not dead_mask >> c & 1]
+        self.cards[:] = live + [c for c in FULL_DECK if dead_mask >> c & 1]
+        for i, c in enumerate(self.cards):
+            self.position[c] = i
+        self.live = len(live)
+        self.reset()
+
+    def reset(self):
+        self.size = self.live
+        self.top = 0
+
+    def __len__(self):
+        return self.size - self.top
+
+    def __contains__(self, card):
+        return self.top <= self.position[card] < self.size
+
+    def remove(self, card):
+        """Takes an undealt card out of the deck until the next reset."""
+        i = self.position[card]
+        if not self.top <= i < self.size:
+            raise ValueError(f"Card {card} is not in the deck.")
+        self.size -= 1
+        last = self.cards[self.size]
+        self.cards[i], self.cards[self.size] = last, card
+        self.position[last], self.position[card] = i, self.size
+
+    def deal(self, k):
+        top, size = self.top, self.size
+        end = top + k
+        if end > size:
+            raise ValueError("Not enough cards in the deck to deal.")
+        cards, position, rand = self.cards, self.position, self.rng.random
+        for i in range(top, end):
+            j = i + int(rand() * (size - i))
+            a, b = cards[j], cards[i]
+            cards[i], cards[j] = a, b
+            position[a], position[b] = i, j
+        self.top = end
+        return cards[top:end]
+
+
+def equity_vs_random(hero_cards, board_cards=(), num_opponents=1, num_simulations=500, rng=random):
+    """
+    Hero's share of the pot against `num_opponents` random hands, averaged
+    over `num_simulations` random deals of the opponents and the rest of the board.
+    """
+    dead = card_mask(hero_cards) | card_mask(board_cards)
+    deck = [c for c in FULL_DECK if not dead >> c & 1]
+    n = len(deck)
+    missing = 5 - len(board_cards)
+    need = missing + 2 * num_opponents
+    if need > n:
+        raise ValueError("Not enough cards left to deal every opponent.")
+
+    board_masks = suit_masks(board_cards)
+    hero_masks = suit_masks(hero_cards)
+    rand = rng.random
+    share = 0.0
+    for _ in range(num_simulations):
+        # partial Fisher-Yates: only the first `need` positions are reshuffled
+        for i in range(need):
+            j = i + int(rand() * (n - i))
+            deck[i], deck[j] = deck[j], deck[i]
+        board = board_masks[:]
+        for c in deck[:missing]:
+            board[c & 3] |= RANK_BIT[c]
+        hero = evaluate_masks(
+            board[0] | hero_masks[0], board[1] | hero_masks[1],
+            board[2] | hero_masks[2], board[3] | hero_masks[3]
+        )
+        best = hero
+        winners = 1
+        for k in range(missing, need, 2):
+            villain = board[:]
+            a, b = deck[k], deck[k + 1]
+            villain[a & 3] |= RANK_BIT[a]
+            villain[b & 3] |= RANK_BIT[b]
+            score = evaluate_masks(*villain)
+            if score > best:
+                best = score
+                break
+            if score == best:
+                winners += 1
+        if best == hero:
+            share += 1.0 / winners
+    return share / num_simulations
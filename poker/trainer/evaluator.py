@@ -0,0 +1,210 @@
+# poker/trainer/evaluator.py
+"""
+Fast hand evaluator working on integer cards.
+
+A card is an int in 0..51: rank_index * 4 + suit_index, with ranks ordered
+'23456789TJQKA' and suits 'hdcs'. `evaluate` takes 5 to 7 cards and returns
+an int score where a higher score is a better hand; the hand category
+(1 = High Card ... 9 = Straight Flush, named in HAND_NAMES) is
+`score >> CATEGORY_SHIFT`.
+
+This is the single card core of the project: the model `Card` objects,
+the string format ('As') and treys' integer cards all convert to and from
+these ids through precomputed tables.
+"""
+from functools import lru_cache
+
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'hdcs'
+
+HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(1, 10)
+
+HAND_NAMES = {
+    9: 'Straight Flush', 8: 'Four of a Kind', 7: 'Full House',
+    6: 'Flush', 5: 'Straight', 4: 'Three of a Kind',
+    3: 'Two Pair', 2: 'Pair', 1: 'High Card'
+}
+
+CATEGORY_SHIFT = 26
+MAJOR_SHIFT = 13
+
+FULL_DECK = tuple(range(52))
+
+# --- Card conversion ---
+CARD_STRINGS = tuple(r + s for r in RANK_CHARS for s in SUIT_CHARS)
+_CARD_IDS = {s: i for i, s in enumerate(CARD_STRINGS)}
+
+
+def card_from_str(card_string):
+    try:
+        return _CARD_IDS[card_string[0].upper() + card_string[1].lower()]
+    except (KeyError, IndexError):
+        raise ValueError(f"Invalid card: {card_string!r}")
+
+
+def card_to_str(card):
+    return CARD_STRINGS[card]
+
+
+def cards_from_str(cards_string):
+    """Parses a concatenated card string such as 'AsKd7h' into card ints."""
+    if len(cards_string) % 2 != 0:
+        raise ValueError("Invalid hand string format.")
+    return [card_from_str(cards_string[i:i+2]) for i in range(0, len(cards_string), 2)]
+
+
+def cards_to_str(cards):
+    return ''.join(CARD_STRINGS[c] for c in cards)
+
+
+# --- treys interop ---
+# treys packs a card as bitrank << 16 | suit << 12 | rank << 8 | rank prime
+_TREYS_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_TREYS_SUITS = {'s': 1, 'h': 2, 'd': 4, 'c': 8}
+TREYS_CARDS = tuple(
+    (1 << (c >> 2)) << 16 | _TREYS_SUITS[SUIT_CHARS[c & 3]] << 12 | (c >> 2) << 8 | _TREYS_PRIMES[c >> 2]
+    for c in range(52)
+)
+_FROM_TREYS = {t: c for c, t in enumerate(TREYS_CARDS)}
+
+
+def card_to_treys(card):
+    return TREYS_CARDS[card]
+
+
+def card_from_treys(treys_card):
+    try:
+        return _FROM_TREYS[treys_card]
+    except KeyError:
+        raise ValueError(f"Invalid treys card: {treys_card!r}")
+
+
+# --- Lookup tables over 13-bit rank masks ---
+_MASKS = 1 << 13
+RANK_BIT = tuple(1 << (c >> 2) for c in FULL_DECK)
+POPCOUNT = tuple(bin(m).count('1') for m in range(_MASKS))
+
+
+def _top_bits_table(count):
+    # TOP_BITS[count][mask] keeps only the `count` highest set bits of mask
+    tables = [[0] * _MASKS]
+    for k in range(1, count + 1):
+        prev = tables[-1]
+        table = [0] * _MASKS
+        for m in range(1, _MASKS):
+            high = 1 << (m.bit_length() - 1)
+            table[m] = high | prev[m ^ high]
+        tables.append(table)
+    return tables
+
+
+TOP_BITS = _top_bits_table(5)
+
+
+def _straight_table():
+    # STRAIGHT_HIGH[mask] is 1 + index of the straight's top rank, 0 if none
+    table = [0] * _MASKS
+    runs = [(0b11111 << low, low + 4) for low in range(9)]
+    wheel = 0b1000000001111  # A2345
+    for m in range(_MASKS):
+        best = 0
+        for run, high in runs:
+            if m & run == run:
+                best = high + 1
+        if not best and m & wheel == wheel:
+            best = 4  # five-high
+        table[m] = best
+    return table
+
+
+STRAIGHT_HIGH = _straight_table()
+
+
+# --- Evaluation ---
+def evaluate(cards):
+    """Scores a 5 to 7 card hand; higher is better."""
+    s0 = s1 = s2 = s3 = 0
+    for c in cards:
+        suit = c & 3
+        if suit == 0:
+            s0 |= RANK_BIT[c]
+        elif suit == 1:
+            s1 |= RANK_BIT[c]
+        elif suit == 2:
+            s2 |= RANK_BIT[c]
+        else:
+            s3 |= RANK_BIT[c]
+    return evaluate_masks(s0, s1, s2, s3)
+
+
+def evaluate_masks(s0, s1, s2, s3):
+    """Scores a hand given the rank mask held in each suit."""
+    for m in (s0, s1, s2, s3):
+        if POPCOUNT[m] >= 5:
+            high = STRAIGHT_HIGH[m]
+            if high:
+                return (STRAIGHT_FLUSH << CATEGORY_SHIFT) | (high << MAJOR_SHIFT)
+            return (FLUSH << CATEGORY_SHIFT) | TOP_BITS[5][m]
+
+    ranks = s0 | s1 | s2 | s3
+    quads = s0 & s1 & s2 & s3
+    if quads:
+        return (FOUR_OF_A_KIND << CATEGORY_SHIFT) | (quads << MAJOR_SHIFT) | TOP_BITS[1][ranks ^ quads]
+
+    trips_plus = (s0 & s1 & s2) | (s0 & s1 & s3) | (s0 & s2 & s3) | (s1 & s2 & s3)
+    pairs_plus = (s0 & s1) | (s0 & s2) | (s0 & s3) | (s1 & s2) | (s1 & s3) | (s2 & s3)
+    pairs = pairs_plus ^ trips_plus
+    if trips_plus:
+        trips = TOP_BITS[1][trips_plus]
+        rest = (trips_plus ^ trips) | pairs
+        if rest:
+            return (FULL_HOUSE << CATEGORY_SHIFT) | (trips << MAJOR_SHIFT) | TOP_BITS[1][rest]
+
+    high = STRAIGHT_HIGH[ranks]
+    if high:
+        return (STRAIGHT << CATEGORY_SHIFT) | (high << MAJOR_SHIFT)
+    if trips_plus:
+        return (THREE_OF_A_KIND << CATEGORY_SHIFT) | (trips_plus << MAJOR_SHIFT) | TOP_BITS[2][ranks ^ trips_plus]
+    if pairs:
+        if POPCOUNT[pairs] >= 2:
+            two = TOP_BITS[2][pairs]
+            return (TWO_PAIR << CATEGORY_SHIFT) | (two << MAJOR_SHIFT) | TOP_BITS[1][ranks ^ two]
+        return (PAIR << CATEGORY_SHIFT) | (pairs << MAJOR_SHIFT) | TOP_BITS[3][ranks ^ pairs]
+    return (HIGH_CARD << CATEGORY_SHIFT) | TOP_BITS[5][ranks]
+
+
+def hand_category(score):
+    return score >> CATEGORY_SHIFT
+
+
+def hand_name(score):
+    return HAND_NAMES[score >> CATEGORY_SHIFT]
+
+
+@lru_cache(maxsize=None)
+def _treys_rank_table():
+    # every distinct 5-card hand value: suited versions of each 5-rank set,
+    # then each rank multiset dealt over rotating suits so it cannot be a flush
+    scores = set()
+    for ranks in range(_MASKS):
+        if POPCOUNT[ranks] == 5:
+            scores.add(evaluate_masks(ranks, 0, 0, 0))
+
+    def multisets(start, size):
+        if size == 0:
+            yield []
+            return
+        for rank in range(start, 13):
+            for rest in multisets(rank, size - 1):
+                yield [rank] + rest
+
+    for ranks in multisets(0, 5):
+        if max(ranks.count(r) for r in ranks) <= 4:
+            scores.add(evaluate([rank * 4 + k % 4 for k, rank in enumerate(ranks)]))
+    ordered = sorted(scores, reverse=True)
+    return {score: i + 1 for i, score in enumerate(ordered)}
+
+
+def treys_rank(score):
+    """The treys Evaluator value of a hand: 1 (royal flush) to 7462 (seven high)."""
+    return _treys_rank_table()[score]
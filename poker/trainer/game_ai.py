@@ -1,69 +1,111 @@
-from treys import Card, Evaluator, Deck
+from functools import lru_cache
+from poker.metrics import METRICS
+from poker.trainer.evaluator import card_from_str, evaluate, treys_rank
 import random
 
+RANK_INDEX = {r: i for i, r in enumerate('23456789TJQKA')}
+
+def chen_formula(card1, card2):
+    """Chen formula score of two hole cards given as strings, e.g. 'As', 'Kd'"""
+    rank_points = {
+        'A': 10, 'K': 8, 'Q': 7, 'J': 6, 'T': 5,
+        '9': 4.5, '8': 4, '7': 3.5, '6': 3, '5': 2.5,
+        '4': 2, '3': 1.5, '2': 1
+    }
+    rank_order = '23456789TJQKA'
+
+    r1, s1 = card1[0], card1[1]
+    r2, s2 = card2[0], card2[1]
+
+    high_card = r1 if rank_points[r1] >= rank_points[r2] else r2
+    low_card = r2 if high_card == r1 else r1
+
+    value = rank_points[high_card]
+
+    if r1 == r2:
+        value = max(value * 2, 5)
+    else:
+        if s1 == s2:
+            value += 2
+
+        gap = abs(rank_order.index(r1) - rank_order.index(r2)) - 1
+        if gap == 1:
+            value -= 1
+        elif gap == 2:
+            value -= 2
+        elif gap == 3:
+            value -= 4
+        elif gap >= 4:
+            penalty = 5
+            if rank_order.index(high_card) < rank_order.index('Q'):
+                penalty /= 2
+            value -= penalty
+
+        if gap <= 1 and rank_order.index(r1) >= rank_order.index('8') and rank_order.index(r2) >= rank_order.index('8'):
+            value += 1
+
+    return max(value, 0)
+
+def preflop_index(card1, card2):
+    """
+    Index of the starting hand in a 13x13 grid: suited hands above the
+    diagonal, offsuit below, pairs on it
+    """
+    r1, r2 = RANK_INDEX[card1[0]], RANK_INDEX[card2[0]]
+    high, low = (r1, r2) if r1 >= r2 else (r2, r1)
+    if card1[1] == card2[1]:
+        return high * 13 + low
+    return low * 13 + high
+
+def _build_chen_table():
+    table = [0] * 169
+    ranks = '23456789TJQKA'
+    for high, high_char in enumerate(ranks):
+        for low_char in ranks[:high + 1]:
+            offsuit = (high_char + 's', low_char + 'h')
+            table[preflop_index(*offsuit)] = chen_formula(*offsuit)
+            if low_char != high_char:
+                suited = (high_char + 's', low_char + 's')
+                table[preflop_index(*suited)] = chen_formula(*suited)
+    return table
+
+# Chen values of all 169 starting hands, so preflop strength is a table read
+CHEN_TABLE = _build_chen_table()
+
+@lru_cache(maxsize=8192)
+def postflop_strength(hole_cards, community_cards):
+    """
+    Hand value on the treys Evaluator scale normalized to 0-10, memoized per
+    (hole cards, board) so repeated decisions in the same hand don't re-evaluate
+    """
+    cards = [card_from_str(c) for c in hole_cards] + [card_from_str(c) for c in community_cards]
+
+    raw_score = treys_rank(evaluate(cards))
+    # Evaluator scores: lower is better (1 = Royal Flush, 7462 = worst)
+    # Normalize to 0-10 where 10 = best possible hand, 0 = worst
+    normalized_strength = max(0, 10 - (raw_score / 7462 * 10))
+    return round(normalized_strength, 2)
+
+METRICS.register_cache("postflop_strength", postflop_strength.cache_info)
+
 class GameAI:
-    def __init__(self):
-        self.evaluator = Evaluator()
-        
+    def __init__(self, rng=random):
+        self.rng = rng
+
     def get_hand_strength(self, hole_cards, community_cards):
         """
         Returns hand strength:
         - Preflop: Chen formula (0-10)
-        - Postflop: treys Evaluator (converted to 0-10)
+        - Postflop: hand value on the treys scale (converted to 0-10)
         """
         if len(community_cards) == 0:
             # Preflop: Chen formula
             return self.chen_value(hole_cards[0], hole_cards[1])
         else:
-            # Postflop: Evaluator score normalized
-            hero_cards = [Card.new(hole_cards[0]), Card.new(hole_cards[1])]
-            board = [Card.new(c) for c in community_cards]
-
-            raw_score = self.evaluator.evaluate(board, hero_cards)
-            # Evaluator scores: lower is better (1 = Royal Flush, 7462 = worst)
-            # Normalize to 0-10 where 10 = best possible hand, 0 = worst
-            normalized_strength = max(0, 10 - (raw_score / 7462 * 10))
-            return round(normalized_strength, 2)
+            return postflop_strength(tuple(hole_cards), tuple(community_cards))
 
     def chen_value(self, card1, card2):
-        rank_points = {
-            'A': 10, 'K': 8, 'Q': 7, 'J': 6, 'T': 5,
-            '9': 4.5, '8': 4, '7': 3.5, '6': 3, '5': 2.5,
-            '4': 2, '3': 1.5, '2': 1
-        }
-        rank_order = '23456789TJQKA'
-
-        r1, s1 = card1[0], card1[1]
-        r2, s2 = card2[0], card2[1]
-
-        high_card = r1 if rank_points[r1] >= rank_points[r2] else r2
-        low_card = r2 if high_card == r1 else r1
-
-        value = rank_points[high_card]
-
-        if r1 == r2:
-            value = max(value * 2, 5)
-        else:
-            if s1 == s2:
-                value += 2
-
-            gap = abs(rank_order.index(r1) - rank_order.index(r2)) - 1
-            if gap == 1:
-                value -= 1
-            elif gap == 2:
-                value -= 2
-            elif gap == 3:
-                value -= 4
-            elif gap >= 4:
-                penalty = 5
-                if rank_order.index(high_card) < rank_order.index('Q'):
-                    penalty /= 2
-                value -= penalty
-
-            if gap <= 1 and rank_order.index(r1) >= rank_order.index('8') and rank_order.index(r2) >= rank_order.index('8'):
-                value += 1
-
-        return max(value, 0)
+        return CHEN_TABLE[preflop_index(card1, card2)]
 
     def get_recommendation(self, hole_cards, community_cards, position, stack_size, pot_size, num_players, opponent_actions, board_texture='neutral'):
         # Calculate hand strength
@@ -77,14 +119,14 @@ class GameAI:
             action = 'call'
             amount = 0
         elif hand_strength > 3:
-            if random.random() < 0.3:  # 30% chance to bluff
+            if self.rng.random() < 0.3:  # 30% chance to bluff
                 action = 'bet'
                 amount = min(pot_size * 0.5, stack_size)
             else:
                 action = 'fold'
                 amount = 0
         else:
-            if random.random() < 0.1:  # 10% chance to bluff
+            if self.rng.random() < 0.1:  # 10% chance to bluff
                 action = 'bet'
                 amount = min(pot_size * 0.5, stack_size)
             else:
@@ -96,4 +138,51 @@ class GameAI:
     def get_ai_action(self, hole_cards, community_cards, position, stack_size, pot_size, num_players, opponent_actions, board_texture='neutral'):
         """Get AI action for the bot to use"""
         rec = self.get_recommendation(hole_cards, community_cards, position, stack_size, pot_size, num_players, opponent_actions, board_texture)
-        return rec 
\ No newline at end of file
+        return rec 
+
+    def get_heads_up_action(self, hole_cards, community_cards, stack_size, current_bet=0):
+        """Threshold AI used by the heads-up game when no trained policy is loaded"""
+        hand_strength = self.get_hand_strength(hole_cards, community_cards)
+        
+        # More aggressive betting - AI will bet more often
+        if hand_strength > 7:
+            action = 'bet'
+            amount = min(75, stack_size)  # Bigger bets for strong hands
+        elif hand_strength > 6:
+            action = 'bet'
+            amount = min(50, stack_size)
+        elif hand_strength > 5:
+            if current_bet == 0:
+                if self.rng.random() < 0.6:  # 60% chance to bet with decent hands
+                    action = 'bet'
+                    amount = min(30, stack_size)
+                else:
+                    action = 'check'
+                    amount = 0
+            else:
+                action = 'call'
+                amount = current_bet
+        elif hand_strength > 3:
+            if self.rng.random() < 0.4:  # 40% chance to bluff
+                action = 'bet'
+                amount = min(25, stack_size)
+            else:
+                if current_bet == 0:
+                    action = 'check'
+                    amount = 0
+                else:
+                    action = 'fold'
+                    amount = 0
+        else:
+            if self.rng.random() < 0.2:  # 20% chance to bluff
+                action = 'bet'
+                amount = min(15, stack_size)
+            else:
+                if current_bet == 0:
+                    action = 'check'
+                    amount = 0
+                else:
+                    action = 'fold'
+                    amount = 0
+                
+        return {'action': action, 'amount': amount}
@@ -0,0 +1,149 @@
+# poker/trainer/grading.py
+"""
+EV-based grading of puzzle decisions.
+
+One simulation pass prices all three actions. Each trial deals every
+opponent a hand from its profile range and completes the board, then:
+- call: the player's pot share of pot + call, against everyone;
+- raise: each opponent continues only if its hand is in its continue range
+  (the strongest part of its range on this board, sized by the minimum
+  defense frequency against the raise); if nobody continues the player takes
+  the pot, otherwise the player's pot share is taken against the opponents
+  that continue, who put in as much of the raise as their stacks allow.
+Fold is worth 0. EVs are in chips, relative to folding now.
+
+Amounts are capped by stacks (`player_chips_remaining`,
+`Opponent.chips_remaining`) and any part of the raise no one can match is
+returned; side pots between short-stacked opponents are not modelled.
+Grades are cached per spot, profile version and seed.
+"""
+import random
+from functools import lru_cache
+
+from poker.metrics import METRICS
+from poker.trainer.engine import PROFILES, _deal_opponents, _deal_rest
+from poker.trainer.equity import ReusableDeck, card_mask
+from poker.trainer.evaluator import cards_from_str, card_to_str, evaluate
+from poker.trainer.game_ai import CHEN_TABLE, preflop_index
+from poker.trainer.ranges import COMBOS, COMBO_MASKS, combo_index
+
+ACTIONS = ('fold', 'call', 'raise')
+
+
+def continue_range(compiled, board_cards, known_mask, continue_fraction):
+    """
+    1326-bit mask of the combos an opponent continues with: its strongest
+    live combos (made hand on the board, Chen value preflop) up to
+    `continue_fraction` of the range's live weight.
+    """
+    live = [i for i in compiled.combos if not COMBO_MASKS[i] & known_mask]
+    if board_cards:
+        def strength(i):
+            return evaluate(list(COMBOS[i]) + board_cards)
+    else:
+        def strength(i):
+            a, b = COMBOS[i]
+            return CHEN_TABLE[preflop_index(card_to_str(a), card_to_str(b))]
+    live.sort(key=strength, reverse=True)
+    target = continue_fraction * sum(compiled.weights[i] for i in live)
+    mask = 0
+    kept = 0.0
+    for i in live:
+        if kept >= target:
+            break
+        mask |= 1 << i
+        kept += compiled.weights[i]
+    return mask
+
+
+def grade_spot(player_hand_str, board_cards_str, pot_size, bet_to_call, player_chips, opponents,
+               raise_amount=None, num_simulations=5000, seed=None):
+    """
+    EV of fold, call and raise for a spot. `opponents` is a list of
+    (profile name, chips remaining). `raise_amount` is the raise on top of
+    the call, a pot-sized raise by default. Cached per spot; a `seed`
+    makes the simulation, and so the cached grade, reproducible.
+    """
+    compiled = tuple(PROFILES.get(op_type) for op_type, _ in opponents)
+    return _grade(
+        player_hand_str, board_cards_str, pot_size, bet_to_call, player_chips,
+        tuple((r, chips) for r, (_, chips) in zip(compiled, opponents)), raise_amount, num_simulations, seed
+    )
+
+
+@lru_cache(maxsize=1024)
+def _grade(player_hand_str, board_cards_str, pot_size, bet_to_call, player_chips, opponents,
+           raise_amount, num_simulations, seed):
+    # `opponents` holds the compiled ranges, so editing a profile starts a new cache entry
+    player_hand = cards_from_str(player_hand_str)
+    board_cards = cards_from_str(board_cards_str)
+    known = card_mask(player_hand) | card_mask(board_cards)
+    ranges = [compiled for compiled, _ in opponents]
+    rng = random.Random(seed) if seed is not None else random
+    deck = ReusableDeck(known, rng)
+
+    call = min(bet_to_call, player_chips)
+    if raise_amount is None:
+        raise_amount = pot_size + call
+    raise_by = max(0, min(raise_amount, player_chips - call))
+    matched = [min(raise_by, chips) for _, chips in opponents]
+    # minimum defense frequency: how much of its range an opponent must continue with
+    pot_after_call = pot_size + call
+    continue_fraction = pot_after_call / (pot_after_call + raise_by) if raise_by else 1.0
+    continues = [continue_range(r, board_cards, known, continue_fraction) for r in ranges]
+
+    call_total = raise_total = share_total = 0.0
+    all_fold = 0
+    for _ in range(num_simulations):
+        opp_hands, _ = _deal_opponents(ranges, known, rng)
+        community = _deal_rest(opp_hands, board_cards, deck)
+        player_rank = evaluate(player_hand + community)
+        opp_ranks = [evaluate(hand + community) for hand in opp_hands]
+
+        best = max(opp_ranks) if opp_ranks else 0
+        share = 0.0 if best > player_rank else 1.0 / (1 + opp_ranks.count(player_rank))
+        share_total += share
+        call_total += share * (pot_size + call) - call
+
+        callers = [
+            k for k, hand in enumerate(opp_hands)
+            if continues[k] >> combo_index(hand[0], hand[1]) & 1
+        ]
+        if not callers:
+            all_fold += 1
+            raise_total += pot_size
+            continue
+        risked = call + max(matched[k] for k in callers)
+        pot = pot_size + risked + sum(matched[k] for k in callers)
+        best = max(opp_ranks[k] for k in callers)
+        if best > player_rank:
+            raise_total -= risked
+        else:
+            winners = 1 + sum(1 for k in callers if opp_ranks[k] == player_rank)
+            raise_total += pot / winners - risked
+
+    ev = {
+        'fold': 0.0,
+        'call': call_total / num_simulations,
+        'raise': raise_total / num_simulations if raise_by else None,
+    }
+    best_action = max((a for a in ACTIONS if ev[a] is not None), key=lambda a: ev[a])
+    return {
+        "correct_action": best_action,
+        "ev": ev,
+        "equity_percentage": share_total / num_simulations * 100,
+        "pot_odds_percentage": call / (pot_size + call) * 100 if call else 0.0,
+        "raise_amount": raise_by,
+        "fold_equity_percentage": all_fold / num_simulations * 100,
+    }
+
+
+METRICS.register_cache("grade", _grade.cache_info)
+
+
+def grade_puzzle(puzzle, num_simulations=5000, seed=None):
+    return grade_spot(
+        puzzle.player_hand, puzzle.board_cards, puzzle.pot_size, puzzle.bet_to_call,
+        puzzle.player_chips_remaining, [(op.type, op.chips_remaining) for op in puzzle.opponents],
+        num_simulations=num_simulations, seed=seed
+    )
@@ -0,0 +1,98 @@
+# poker/trainer/hand_grid.py
+"""
+13x13 starting-hand equity grid against an opponent range on a board.
+
+All 169 classes come from one `range_equity.class_grid` pass over shared
+runouts. Grids are cached per board texture: boards that are suit
+relabellings of each other (Qh7h2c, Qs7s2d, ...) give the same grid
+against a range that treats the suits alike, which every class-based
+profile does, so they share one entry keyed by the canonical board.
+Ranges holding specific suited combos are cached per exact board.
+"""
+import random
+from functools import lru_cache
+from itertools import permutations
+
+from poker.metrics import METRICS
+from poker.trainer.engine import _range_weights
+from poker.trainer.evaluator import RANK_CHARS, cards_from_str
+from poker.trainer.isomorphism import HandIndexer
+from poker.trainer.range_equity import class_grid
+from poker.trainer.ranges import COMBOS, NUM_COMBOS, combo_index
+
+# Chart order: aces first
+GRID_RANKS = RANK_CHARS[::-1]
+
+# Every relabelling of the four suits, as card -> card tables
+_SUIT_PERMUTATIONS = [
+    tuple((c & ~3) | perm[c & 3] for c in range(52)) for perm in permutations(range(4))
+]
+
+
+@lru_cache(maxsize=None)
+def _board_indexer(board_size):
+    return HandIndexer((board_size,))
+
+
+@lru_cache(maxsize=64)
+def _suit_symmetric(weights):
+    for table in _SUIT_PERMUTATIONS:
+        for i in range(NUM_COMBOS):
+            a, b = COMBOS[i]
+            if weights[combo_index(table[a], table[b])] != weights[i]:
+                return False
+    return True
+
+
+def grid_hand(row, col):
+    """Class name of a chart cell: pairs on the diagonal, suited above, offsuit below."""
+    high, low = GRID_RANKS[min(row, col)], GRID_RANKS[max(row, col)]
+    if row == col:
+        return high + low
+    return high + low + ('s' if col > row else 'o')
+
+
+@lru_cache(maxsize=256)
+def _cached_grid(board, weights, max_runouts, seed):
+    # `board` is the canonical board of its texture for suit-symmetric ranges
+    equities, runouts, exact = class_grid(weights, list(board), max_runouts, random.Random(seed))
+    grid = []
+    for row in range(13):
+        cells = []
+        for col in range(13):
+            high, low = 12 - min(row, col), 12 - max(row, col)
+            cell = high * 13 + low if col > row else low * 13 + high
+            equity = equities[cell]
+            cells.append(None if equity is None else equity * 100)
+        grid.append(cells)
+    return {"runouts": runouts, "exact": exact, "equity": grid}
+
+
+def equity_grid(villain_range, board_cards_str="", max_runouts=1200, seed=0):
+    """
+    Equity (percent) of every starting-hand class against `villain_range`
+    on the board, as a 13x13 chart with aces first: `hands[row][col]` names
+    each cell and `equity[row][col]` is its equity, None for classes the
+    board blocks entirely. The range is an opponent type, range notation,
+    a list of hand classes or a 1326-entry weight vector (see
+    engine.calculate_range_equity). `seed` fixes the sampled runouts when
+    there are more than `max_runouts` (preflop), so cached grids are stable.
+    """
+    board_cards = cards_from_str(board_cards_str)
+    weights = tuple(_range_weights(villain_range))
+    if len(board_cards) > 5 or len(set(board_cards)) != len(board_cards):
+        raise ValueError("The board must be up to five distinct cards.")
+    board = tuple(board_cards)
+    if board and _suit_symmetric(weights):
+        board = tuple(_board_indexer(len(board)).canonicalize(board_cards))
+    with METRICS.timer('grid'):
+        result = _cached_grid(board, weights, max_runouts, seed)
+    return {
+        "board": board_cards_str,
+        "ranks": list(GRID_RANKS),
+        "hands": [[grid_hand(row, col) for col in range(13)] for row in range(13)],
+        **result,
+    }
+
+
+METRICS.register_cache("equity_grid", _cached_grid.cache_info)
@@ -0,0 +1,197 @@
+# poker/trainer/heads_up_game.py
+"""
+Headless heads-up no-limit hold'em engine.
+
+`HeadsUpGame` is a pure state machine: no printing, no input. A front end
+(the console game, the server, a self-play runner) starts a hand, asks who
+is to act and what is legal, and feeds actions back in. Every state change
+is reported as an event dict so front ends can render the hand however they
+like.
+
+Seats are 0 and 1. The button posts the small blind and acts first preflop;
+the other seat acts first on every later street. A 'bet' amount is the size
+of the raise on top of whatever the actor has to call.
+"""
+import random
+
+from poker.trainer.evaluator import FULL_DECK, card_to_str, evaluate
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+STREET_CARDS = {'flop': 3, 'turn': 1, 'river': 1}
+
+
+class HeadsUpGame:
+    __slots__ = (
+        'stacks', 'small_blind', 'big_blind', 'rng', 'button', 'hole_cards', 'board',
+        'street', 'pot', 'committed', 'history', 'to_act', 'hand_over', 'winner',
+        '_runout', '_acted', '_min_raise'
+    )
+
+    def __init__(self, stacks=(1000, 1000), small_blind=0, big_blind=0, rng=random):
+        self.stacks = list(stacks)
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.rng = rng
+        self.button = 0
+        self.hole_cards = [[], []]
+        self.board = []
+        self.street = None
+        self.pot = 0
+        self.committed = [0, 0]  # chips put in on the current street
+        self.history = []  # action names taken this hand, in order
+        self.to_act = None
+        self.hand_over = True
+        self.winner = None  # seat, or None for a split pot
+        self._runout = []
+        self._acted = [False, False]
+        self._min_raise = 1
+
+    # --- Hand lifecycle ---
+    def start_hand(self, button=None, deal=None):
+        """
+        Deals a new hand and posts blinds. `deal` optionally fixes the cards:
+        nine card ints, seat 0's hole cards, seat 1's, then the five board cards.
+        """
+        if min(self.stacks) <= 0:
+            raise ValueError("Both players need chips to start a hand.")
+        if button is not None:
+            self.button = button
+        cards = list(deal) if deal is not None else self.rng.sample(FULL_DECK, 9)
+        self.hole_cards = [cards[0:2], cards[2:4]]
+        self._runout = cards[4:9]
+        self.board = []
+        self.street = 'preflop'
+        self.pot = 0
+        self.committed = [0, 0]
+        self.history = []
+        self.hand_over = False
+        self.winner = None
+        self._acted = [False, False]
+        self._min_raise = max(self.big_blind, 1)
+
+        events = [{'type': 'deal', 'button': self.button}]
+        blinds = ((self.button, self.small_blind), (1 - self.button, self.big_blind))
+        for seat, blind in blinds:
+            if blind:
+                posted = self._put(seat, blind)
+                events.append({'type': 'blind', 'seat': seat, 'amount': posted})
+        self.to_act = self.button
+        return events
+
+    def legal_actions(self):
+        if self.hand_over:
+            return []
+        seat = self.to_act
+        to_call = self.to_call()
+        actions = ['fold', 'call'] if to_call else ['fold', 'check']
+        if self.stacks[seat] > to_call and self.stacks[1 - seat] > 0:
+            actions.append('bet')
+        return actions
+
+    def to_call(self, seat=None):
+        seat = self.to_act if seat is None else seat
+        return self.committed[1 - seat] - self.committed[seat]
+
+    def min_bet(self):
+        return min(self._min_raise, self.stacks[self.to_act] - self.to_call())
+
+    def apply_action(self, action, amount=0):
+        """Applies the current actor's action and returns the resulting events."""
+        if self.hand_over:
+            raise ValueError("The hand is over.")
+        seat = self.to_act
+        to_call = self.to_call()
+        if action == 'call' and not to_call:
+            action = 'check'
+        if action not in self.legal_actions():
+            raise ValueError(f"Illegal action '{action}' (legal: {self.legal_actions()})")
+
+        self.history.append(action)
+        self._acted[seat] = True
+        if action == 'fold':
+            events = [{'type': 'action', 'seat': seat, 'action': 'fold', 'amount': 0}]
+            return events + self._award(1 - seat)
+        if action == 'check':
+            events = [{'type': 'action', 'seat': seat, 'action': 'check', 'amount': 0}]
+        elif action == 'call':
+            paid = self._put(seat, to_call)
+            events = [{'type': 'action', 'seat': seat, 'action': 'call', 'amount': paid}]
+            if paid < to_call:
+                # all-in for less: return the uncalled part of the bet
+                refund = to_call - paid
+                self.committed[1 - seat] -= refund
+                self.stacks[1 - seat] += refund
+                self.pot -= refund
+                events.append({'type': 'refund', 'seat': 1 - seat, 'amount': refund})
+        else:
+            if amount <= 0:
+                raise ValueError("Bet must be positive.")
+            raise_by = max(amount, self._min_raise)
+            paid = self._put(seat, to_call + raise_by)
+            self._min_raise = max(self._min_raise, paid - to_call)
+            self._acted[1 - seat] = False
+            events = [{'type': 'action', 'seat': seat, 'action': 'bet', 'amount': paid}]
+
+        if self._acted[1 - seat] and self.committed[0] == self.committed[1]:
+            events += self._end_street()
+        else:
+            self.to_act = 1 - seat
+        return events
+
+    # --- Internals ---
+    def _put(self, seat, amount):
+        amount = min(amount, self.stacks[seat])
+        self.stacks[seat] -= amount
+        self.committed[seat] += amount
+        self.pot += amount
+        return amount
+
+    def _end_street(self):
+        events = []
+        all_in = min(self.stacks) == 0
+        while True:
+            if self.street == 'river':
+                return events + self._showdown()
+            self.street = STREETS[STREETS.index(self.street) + 1]
+            dealt = self._runout[len(self.board):len(self.board) + STREET_CARDS[self.street]]
+            self.board.extend(dealt)
+            events.append({'type': 'street', 'street': self.street, 'cards': [card_to_str(c) for c in dealt]})
+            if not all_in:
+                break
+        self.committed = [0, 0]
+        self._acted = [False, False]
+        self._min_raise = max(self.big_blind, 1)
+        self.to_act = 1 - self.button
+        return events
+
+    def _showdown(self):
+        scores = [evaluate(self.hole_cards[seat] + self.board) for seat in (0, 1)]
+        winner = 0 if scores[0] > scores[1] else 1 if scores[1] > scores[0] else None
+        events = [{
+            'type': 'showdown',
+            'hole_cards': [[card_to_str(c) for c in cards] for cards in self.hole_cards],
+            'board': [card_to_str(c) for c in self.board],
+        }]
+        return events + self._award(winner)
+
+    def _award(self, winner):
+        pot = self.pot
+        if winner is None:
+            # split pot; the odd chip goes to the player out of position
+            oop = 1 - self.button
+            self.stacks[oop] += pot - pot // 2
+            self.stacks[self.button] += pot // 2
+        else:
+            self.stacks[winner] += pot
+        self.pot = 0
+        self.hand_over = True
+        self.winner = winner
+        self.to_act = None
+        return [{'type': 'hand_end', 'winner': winner, 'pot': pot}]
+
+    # --- Views ---
+    def hole_card_strings(self, seat):
+        return [card_to_str(c) for c in self.hole_cards[seat]]
+
+    def board_strings(self):
+        return [card_to_str(c) for c in self.board]
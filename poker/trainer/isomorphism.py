@@ -0,0 +1,209 @@
+# poker/trainer/isomorphism.py
+"""
+Suit-isomorphic hand indexing.
+
+Two hands are strategically identical when one is a suit relabelling of the
+other (AsKs on Qs7h2d plays exactly like AhKh on Qh7s2c). `HandIndexer` maps
+every hand to a dense integer in 0..size-1 that is shared by all of its suit
+permutations, and back to a canonical representative, so caches and lookup
+tables can be flat arrays of `size` entries.
+
+Cards are dealt in rounds, e.g. (2, 3) for hole cards then a flop or
+(2, 3, 1, 1) for a full hand with the street structure kept. Cards within a
+round are unordered. Sizes for hole cards + an unordered board:
+preflop 169, flop 1,286,792, turn 13,960,050, river 123,156,254.
+
+The scheme follows Waugh's hand isomorphism: each suit is described by the
+ranks it holds in every round; suits are sorted by their per-round card
+counts (their "shape"), and suits sharing a shape are indexed as a multiset.
+"""
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import product
+from math import comb
+
+from poker.trainer.evaluator import POPCOUNT, RANK_BIT
+
+
+def _compositions(total, parts=4):
+    if parts == 1:
+        return [(total,)]
+    return [(first,) + rest for first in range(total + 1) for rest in _compositions(total - first, parts - 1)]
+
+
+def _suit_size(shape):
+    size, used = 1, 0
+    for count in shape:
+        size *= comb(13 - used, count)
+        used += count
+    return size
+
+
+# --- Rank subsets of a single suit ---
+def _subset_index(mask, used):
+    # colex index of `mask` among the ranks not in `used`
+    index = k = 0
+    while mask:
+        low = mask & -mask
+        k += 1
+        index += comb(low.bit_length() - 1 - POPCOUNT[used & (low - 1)], k)
+        mask ^= low
+    return index
+
+
+def _subset_unindex(index, count, used):
+    free = [r for r in range(13) if not used >> r & 1]
+    mask = 0
+    for k in range(count, 0, -1):
+        pos = k - 1
+        while comb(pos + 1, k) <= index:
+            pos += 1
+        index -= comb(pos, k)
+        mask |= 1 << free[pos]
+    return mask
+
+
+# --- Multisets of suit indices within a shape group ---
+def _multiset_index(values):
+    # values sorted ascending; combinations-with-repetition colex rank
+    return sum(comb(v + i, i + 1) for i, v in enumerate(values))
+
+
+def _multiset_unindex(index, k):
+    values = [0] * k
+    for i in range(k - 1, -1, -1):
+        lo, hi = i, i + 1
+        while comb(hi, i + 1) <= index:
+            lo, hi = hi, hi * 2
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if comb(mid, i + 1) <= index:
+                lo = mid
+            else:
+                hi = mid
+        index -= comb(lo, i + 1)
+        values[i] = lo - i
+    return values
+
+
+class HandIndexer:
+    """
+    Dense suit-isomorphic index for hands dealt in rounds of
+    `cards_per_round` cards. `index` accepts the cards of every round dealt
+    so far, in round order, and indexes them at the last complete round.
+    """
+
+    def __init__(self, cards_per_round=(2, 3, 1, 1)):
+        self.cards_per_round = tuple(cards_per_round)
+        self._totals = {}
+        self._configs = []
+        self._offsets = []
+        self._lookup = []
+        total = 0
+        for r, count in enumerate(self.cards_per_round):
+            total += count
+            self._totals[total] = r
+            self._build_round(r)
+
+    def _build_round(self, r):
+        configs = set()
+        for split in product(*(_compositions(c) for c in self.cards_per_round[:r + 1])):
+            shapes = tuple(tuple(split[j][s] for j in range(r + 1)) for s in range(4))
+            if all(sum(shape) <= 13 for shape in shapes):
+                configs.add(tuple(sorted(shapes, reverse=True)))
+
+        entries, offsets, lookup, offset = [], [], {}, 0
+        for config in sorted(configs, reverse=True):
+            groups = []
+            for shape in config:
+                if groups and groups[-1][0] == shape:
+                    groups[-1][1] += 1
+                else:
+                    groups.append([shape, 1])
+            groups = [(shape, k, comb(_suit_size(shape) + k - 1, k)) for shape, k in groups]
+            lookup[config] = (offset, groups)
+            entries.append(groups)
+            offsets.append(offset)
+            size = 1
+            for _, _, group_size in groups:
+                size *= group_size
+            offset += size
+        offsets.append(offset)
+        self._configs.append(entries)
+        self._offsets.append(offsets)
+        self._lookup.append(lookup)
+
+    def size(self, round_index=-1):
+        return self._offsets[round_index][-1]
+
+    def index(self, cards):
+        r = self._totals.get(len(cards))
+        if r is None:
+            raise ValueError(f"Cannot index {len(cards)} cards with rounds {self.cards_per_round}")
+        masks = [[0] * (r + 1) for _ in range(4)]
+        pos = 0
+        for j in range(r + 1):
+            for c in cards[pos:pos + self.cards_per_round[j]]:
+                masks[c & 3][j] |= RANK_BIT[c]
+            pos += self.cards_per_round[j]
+
+        suits = []
+        for suit_masks in masks:
+            shape = tuple(POPCOUNT[m] for m in suit_masks)
+            index = used = 0
+            mult = 1
+            for count, m in zip(shape, suit_masks):
+                index += mult * _subset_index(m, used)
+                mult *= comb(13 - POPCOUNT[used], count)
+                used |= m
+            suits.append((shape, index))
+        suits.sort(reverse=True)
+
+        offset, groups = self._lookup[r][tuple(shape for shape, _ in suits)]
+        index = pos = 0
+        for _, k, group_size in groups:
+            values = sorted(i for _, i in suits[pos:pos + k])
+            index = index * group_size + _multiset_index(values)
+            pos += k
+        return offset + index
+
+    def unindex(self, round_index, index):
+        """Returns the canonical representative of `index`, cards in round order."""
+        offsets = self._offsets[round_index]
+        if not 0 <= index < offsets[-1]:
+            raise ValueError(f"Index {index} out of range for round {round_index}")
+        c = bisect_right(offsets, index) - 1
+        groups = self._configs[round_index][c]
+        index -= offsets[c]
+        group_indices = []
+        for _, _, group_size in reversed(groups):
+            group_indices.append(index % group_size)
+            index //= group_size
+        group_indices.reverse()
+
+        rounds = [[] for _ in range(round_index + 1)]
+        suit = 0
+        for (shape, k, _), group_index in zip(groups, group_indices):
+            for suit_index in _multiset_unindex(group_index, k):
+                used = 0
+                for j, count in enumerate(shape):
+                    radix = comb(13 - POPCOUNT[used], count)
+                    mask = _subset_unindex(suit_index % radix, count, used)
+                    suit_index //= radix
+                    used |= mask
+                    rounds[j].extend(rank * 4 + suit for rank in range(13) if mask >> rank & 1)
+                suit += 1
+        return [c for cards in rounds for c in sorted(cards)]
+
+    def canonicalize(self, cards):
+        return self.unindex(self._totals[len(cards)], self.index(cards))
+
+
+@lru_cache(maxsize=None)
+def street_indexer(board_size):
+    """Indexer for hole cards plus an unordered board of `board_size` cards."""
+    return HandIndexer((2, board_size) if board_size else (2,))
+
+
+def street_index(hole_cards, board_cards=()):
+    return street_indexer(len(board_cards)).index(list(hole_cards) + list(board_cards))
@@ -1,4 +1,4 @@
-import requests
+from poker.metrics import METRICS
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "gemma3"  # Change to your preferred model
@@ -30,11 +30,20 @@ def get_llm_explanation(puzzle, user_action, correct_action, equity_result):
 
     
     """
+    # the HTTP client is only needed here; importing it up front slows every cold start
+    import requests
+
     data = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
         "stream": False
     }
-    response = requests.post(OLLAMA_URL, json=data)
-    response.raise_for_status()
-    return response.json().get("response", "No explanation available.") 
\ No newline at end of file
+    try:
+        with METRICS.timer('llm.request'):
+            response = requests.post(OLLAMA_URL, json=data)
+            response.raise_for_status()
+    except requests.RequestException:
+        METRICS.inc('poker_llm_errors_total')
+        raise
+    with METRICS.timer('llm.decode'):
+        return response.json().get("response", "No explanation available.") 
\ No newline at end of file
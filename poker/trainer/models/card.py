@@ -1,26 +1,70 @@
+from poker.trainer.evaluator import RANK_CHARS, SUIT_CHARS, TREYS_CARDS, card_from_treys
 
 
 class Card:
+    """
+    A playing card backed by its integer id in poker.trainer.evaluator
+    (rank_index * 4 + suit_index). There are only 52 instances: Card('A', 's')
+    always returns the same object, so building decks and converting to the
+    evaluator's ints or treys' ints never allocates.
+    """
     SUITS = {'h': 'Hearts', 'd': 'Diamonds', 'c': 'Clubs', 's': 'Spades'}
     RANKS = {
         '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
         'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
     }
+    RANK_CHARS = list(RANK_CHARS)
 
-    def __init__(self, rank_char, suit_char):
-        if rank_char not in self.RANKS:
+    __slots__ = ('rank_char', 'suit_char', 'rank_value', 'id')
+    _interned = {}
+
+    def __new__(cls, rank_char, suit_char):
+        card = cls._interned.get((rank_char, suit_char))
+        if card is not None:
+            return card
+        if rank_char not in cls.RANKS:
             raise ValueError(f"Invalid rank character: {rank_char}")
-        if suit_char not in self.SUITS:
+        if suit_char not in cls.SUITS:
             raise ValueError(f"Invalid suit character: {suit_char}")
-        self.rank_char = rank_char
-        self.suit_char = suit_char
-        self.rank_value = self.RANKS[rank_char]
+        card = super().__new__(cls)
+        card.rank_char = rank_char
+        card.suit_char = suit_char
+        card.rank_value = cls.RANKS[rank_char]
+        card.id = RANK_CHARS.index(rank_char) * 4 + SUIT_CHARS.index(suit_char)
+        cls._interned[(rank_char, suit_char)] = card
+        return card
+
+    @classmethod
+    def from_id(cls, card_id):
+        return ALL_CARDS[card_id]
+
+    @classmethod
+    def from_str(cls, card_string):
+        return cls(card_string[0].upper(), card_string[1].lower())
+
+    @classmethod
+    def from_treys(cls, treys_card):
+        return ALL_CARDS[card_from_treys(treys_card)]
+
+    def to_treys(self):
+        return TREYS_CARDS[self.id]
 
     def __str__(self):
         return f"{self.rank_char}{self.suit_char}"
 
+    def __repr__(self):
+        return f"Card('{self.rank_char}', '{self.suit_char}')"
+
     def __eq__(self, other):
-        return isinstance(other, Card) and self.rank_char == other.rank_char and self.suit_char == other.suit_char
+        return isinstance(other, Card) and self.id == other.id
 
     def __hash__(self):
-        return hash((self.rank_char, self.suit_char)) 
\ No newline at end of file
+        return self.id
+
+    def __reduce__(self):
+        # unpickle to the interned instance
+        return (Card, (self.rank_char, self.suit_char))
+
+
+# Every card, indexed by evaluator id
+ALL_CARDS = tuple(Card(r, s) for r in RANK_CHARS for s in SUIT_CHARS)
@@ -1,19 +1,32 @@
-from .card import Card
+from .card import ALL_CARDS
+from poker.trainer.equity import ReusableDeck
 import random
 
 class Deck:
-    def __init__(self):
-        self.cards = [Card(r, s) for s in Card.SUITS for r in Card.RANKS]
-        random.shuffle(self.cards)
+    """Card-object view of a ReusableDeck: deal() draws random cards, reset() puts them all back."""
+
+    def __init__(self, rng=random):
+        self._deck = ReusableDeck(rng=rng)
+
+    @property
+    def cards(self):
+        # the undealt cards, as interned Card objects
+        deck = self._deck
+        return [ALL_CARDS[c] for c in deck.cards[deck.top:deck.size]]
+
+    def __len__(self):
+        return len(self._deck)
+
+    def __contains__(self, card):
+        return card.id in self._deck
 
     def deal(self, num_cards):
-        if num_cards > len(self.cards):
-            raise ValueError("Not enough cards in the deck to deal.")
-        dealt = self.cards[:num_cards]
-        self.cards = self.cards[num_cards:]
-        return dealt
+        return [ALL_CARDS[c] for c in self._deck.deal(num_cards)]
 
     def remove_cards(self, cards_to_remove):
         for card in cards_to_remove:
-            if card in self.cards:
-                self.cards.remove(card) 
\ No newline at end of file
+            if card.id in self._deck:
+                self._deck.remove(card.id)
+
+    def reset(self):
+        self._deck.reset()
@@ -3,7 +3,7 @@ from typing import List
 
 @dataclass
 class Opponent:
-    type: str
+    type: str  # opponent profile name, see poker.trainer.profiles
     chips_remaining: int
 
 @dataclass
@@ -0,0 +1,136 @@
+# poker/trainer/outs.py
+"""
+Next-card analysis for flop and turn spots.
+
+For every card that can come next, the player's equity against the
+opponents' ranges is computed exactly: each opponent combo that survives
+the known cards is scored on every completed board, and since the final
+board does not depend on the order the turn and river came in, each board
+is evaluated once and shared by both orders.
+
+Heads-up results are exact. Against several opponents each range is
+resolved against the player's hand and the board independently (card
+removal between opponents is ignored) and the pot is split between every
+opponent that ties the player.
+"""
+from poker.trainer.engine import PROFILES
+from poker.trainer.evaluator import FULL_DECK, RANK_BIT, cards_from_str, card_to_str, evaluate_masks
+from poker.trainer.equity import card_mask, suit_masks
+from poker.trainer.ranges import COMBOS, COMBO_MASKS
+
+NEXT_STREET = {3: 'turn', 4: 'river'}
+
+
+def _live_range(compiled, dead):
+    return [
+        (COMBOS[i], COMBO_MASKS[i], compiled.weights[i]) for i in compiled.combos
+        if not COMBO_MASKS[i] & dead
+    ]
+
+
+def _showdown(hero_cards, board, live_ranges):
+    """
+    (player's pot share, weight) on a complete five-card board, where the
+    weight is the product of each range's live mass so boards are averaged
+    in proportion to how likely the opponents are to hold cards that allow them.
+    """
+    dead = card_mask(board)
+    masks = suit_masks(board)
+    hero = masks[:]
+    for c in hero_cards:
+        hero[c & 3] |= RANK_BIT[c]
+    hero_score = evaluate_masks(*hero)
+
+    # ways[j]: probability that no opponent is ahead and j of them tie the player
+    ways = [1.0]
+    weight = 1.0
+    for live in live_ranges:
+        win = tie = total = 0.0
+        for (a, b), mask, w in live:
+            if mask & dead:
+                continue
+            villain = masks[:]
+            villain[a & 3] |= RANK_BIT[a]
+            villain[b & 3] |= RANK_BIT[b]
+            score = evaluate_masks(*villain)
+            total += w
+            if score < hero_score:
+                win += w
+            elif score == hero_score:
+                tie += w
+        if not total:
+            return 0.0, 0.0
+        win /= total
+        tie /= total
+        ways = [ways[0] * win] + [ways[j] * win + ways[j - 1] * tie for j in range(1, len(ways))] + [ways[-1] * tie]
+        weight *= total
+    return sum(p / (j + 1) for j, p in enumerate(ways)), weight
+
+
+def next_card_equity(player_hand_str, board_cards_str, opponent_types, out_threshold=50.0):
+    """
+    Player equity after each possible next card on a flop or turn board.
+
+    Returns the current equity, every next card with the equity it leaves
+    and its swing against the current equity (all in percent, best cards
+    first), and the outs: cards after which the player's equity is above
+    `out_threshold` and better than now.
+    """
+    hero_cards = cards_from_str(player_hand_str)
+    board_cards = cards_from_str(board_cards_str)
+    if len(board_cards) not in NEXT_STREET:
+        raise ValueError("Next-card analysis needs a flop or turn board.")
+    if not opponent_types:
+        raise ValueError("Next-card analysis needs at least one opponent.")
+
+    known = card_mask(hero_cards) | card_mask(board_cards)
+    live_ranges = [_live_range(PROFILES.get(op_type), known) for op_type in opponent_types]
+    unseen = [c for c in FULL_DECK if not known >> c & 1]
+
+    boards = {}  # completed board cards beyond the known ones -> (share, weight)
+
+    def runout_result(extra):
+        key = tuple(sorted(extra))
+        if key not in boards:
+            boards[key] = _showdown(hero_cards, board_cards + list(key), live_ranges)
+        return boards[key]
+
+    cards = []
+    for c in unseen:
+        if len(board_cards) == 4:
+            share, weight = runout_result((c,))
+        else:
+            share = weight = 0.0
+            for r in unseen:
+                if r != c:
+                    s, w = runout_result((c, r))
+                    share += s * w
+                    weight += w
+            share = share / weight if weight else 0.0
+        cards.append((c, share, weight))
+
+    total_weight = sum(w for _, _, w in cards)
+    if not total_weight:
+        raise ValueError("The opponents' ranges are fully blocked by the known cards.")
+    current = sum(s * w for _, s, w in cards) / total_weight * 100
+
+    results = [
+        {"card": card_to_str(c), "equity": s * 100, "swing": s * 100 - current}
+        for c, s, w in cards if w
+    ]
+    results.sort(key=lambda r: r["equity"], reverse=True)
+    outs = [r["card"] for r in results if r["equity"] > out_threshold and r["swing"] > 0]
+    out_weight = sum(w for c, s, w in cards if card_to_str(c) in outs)
+    return {
+        "next_street": NEXT_STREET[len(board_cards)],
+        "current_equity": current,
+        "cards": results,
+        "outs": outs,
+        "out_percentage": out_weight / total_weight * 100,
+    }
+
+
+def analyze_puzzle_outs(puzzle, out_threshold=50.0):
+    return next_card_equity(
+        puzzle.player_hand, puzzle.board_cards, [op.type for op in puzzle.opponents], out_threshold
+    )
@@ -0,0 +1,114 @@
+# poker/trainer/profiles.py
+"""
+Registry of opponent profiles: named ranges that puzzles and the equity
+engine refer to through `Opponent.type`.
+
+Built-in profiles come from code; more are read from every *.json file in a
+profile directory, each mapping profile names to a range, either in range
+notation ("22+, ATs+, KQo:0.5") or as a list of hand classes. Ranges are
+compiled once (see poker.trainer.ranges.parse_range), and with a `cache_dir`
+read at startup from a compiled artifact on disk instead of being parsed
+(see poker.trainer.ranges.compile_ranges); every process still holds its
+own copy of the compiled ranges. The directory is
+re-scanned at most every `check_interval` seconds and only files whose
+modification time changed are reloaded, so new or edited profiles are picked
+up by a running server. A file that fails to load keeps its previous
+profiles and the error is kept in `errors`.
+"""
+import json
+import os
+import threading
+import time
+
+from poker.trainer.ranges import compile_ranges
+
+
+def profile_notation(definition):
+    if isinstance(definition, str):
+        return definition
+    if isinstance(definition, list) and all(isinstance(h, str) for h in definition):
+        return ','.join(definition)
+    raise ValueError("A profile range must be a range string or a list of hand classes.")
+
+
+def compile_profiles(definitions, cache_dir=None):
+    """{name: compiled range} for a mapping of profile names to definitions."""
+    notations = {name: profile_notation(d) for name, d in definitions.items()}
+    compiled = compile_ranges(notations.values(), cache_dir)
+    return {name: compiled[text] for name, text in notations.items()}
+
+
+class ProfileRegistry:
+    def __init__(self, builtin=None, directory=None, check_interval=1.0, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.builtin = compile_profiles(builtin or {}, cache_dir)
+        self.directory = directory
+        self.check_interval = check_interval
+        self.errors = {}  # file path -> message of its last failed load
+        self._profiles = dict(self.builtin)
+        self._file_profiles = {}
+        self._stamps = {}
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Compiled range of a profile; raises ValueError for unknown names."""
+        self._maybe_reload()
+        try:
+            return self._profiles[name]
+        except KeyError:
+            raise ValueError(f"Unknown opponent type '{name}' (known: {', '.join(sorted(self._profiles))})")
+
+    def __contains__(self, name):
+        self._maybe_reload()
+        return name in self._profiles
+
+    def names(self):
+        self._maybe_reload()
+        return sorted(self._profiles)
+
+    def _maybe_reload(self):
+        if self._checked is None or time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+
+    def _scan(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return {}
+        stamps = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json') and entry.is_file():
+                stamps[entry.path] = entry.stat().st_mtime_ns
+        return stamps
+
+    def _load_file(self, path):
+        with open(path) as f:
+            definitions = json.load(f)
+        if not isinstance(definitions, dict):
+            raise ValueError("A profile file must map profile names to ranges.")
+        return compile_profiles(definitions, self.cache_dir)
+
+    def reload(self):
+        """Re-reads changed profile files; returns True if the profile set changed."""
+        with self._lock:
+            self._checked = time.monotonic()
+            stamps = self._scan()
+            if stamps == self._stamps:
+                return False
+            for path, stamp in stamps.items():
+                if self._stamps.get(path) == stamp:
+                    continue
+                try:
+                    self._file_profiles[path] = self._load_file(path)
+                    self.errors.pop(path, None)
+                except (OSError, ValueError) as e:
+                    self.errors[path] = str(e)
+            for path in set(self._file_profiles) - set(stamps):
+                del self._file_profiles[path]
+                self.errors.pop(path, None)
+            self._stamps = stamps
+
+            profiles = dict(self.builtin)
+            for path in sorted(self._file_profiles):
+                profiles.update(self._file_profiles[path])
+            self._profiles = profiles
+            return True
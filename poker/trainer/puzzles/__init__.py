@@ -1 +1,7 @@
-from .default_puzzles import PUZZLES 
\ No newline at end of file
+def __getattr__(name):
+    # the puzzle bank is built on first access, not when the package is imported
+    if name == "PUZZLES":
+        from .default_puzzles import PUZZLES
+        globals()["PUZZLES"] = PUZZLES
+        return PUZZLES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,4 @@
 from poker.trainer.models.puzzle import Puzzle, Opponent
-import random
 
 PUZZLES = [
     Puzzle(
@@ -521,6 +520,4 @@ PUZZLES += [
     Puzzle(player_hand="JsTs", board_cards="Qs9s8c2d", pot_size=320, bet_to_call=160, player_chips_remaining=800, opponents=[Opponent(type="standard", chips_remaining=600)], current_player_to_act_index=0, question="Flopped straight, turn bricks. Opponent bets half pot. Tough call or raise?"),
     # River - medium fold
     Puzzle(player_hand="7d7c", board_cards="QsKd9hJc3s", pot_size=400, bet_to_call=200, player_chips_remaining=600, opponents=[Opponent(type="tight", chips_remaining=700)], current_player_to_act_index=0, question="Your underpair is crushed. Opponent bets big on river. Fold or hero call?"),
-]
-
-random.shuffle(PUZZLES)
\ No newline at end of file
+]
\ No newline at end of file
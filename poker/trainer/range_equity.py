@@ -0,0 +1,259 @@
+# poker/trainer/range_equity.py
+"""
+Range-vs-range equity on a fixed board.
+
+Ranges are 1326-entry weight vectors (see poker.trainer.ranges). For every
+runout of the board, each live combo of either range is scored once, both
+ranges are sorted by score, and a single sweep gives every hero combo its
+weighted win and tie mass against the whole villain range. Card removal is
+handled by inclusion-exclusion: the sweep keeps running weight totals per
+card, so the villain combos sharing a card with the hero combo are
+subtracted instead of being skipped one pair at a time.
+
+Runouts are enumerated exactly whenever there are at most `max_runouts` of
+them (every flop, turn and river), otherwise sampled.
+"""
+import random
+from itertools import combinations
+
+from poker.trainer.evaluator import FULL_DECK, RANK_BIT, evaluate_masks
+from poker.trainer.equity import card_mask, suit_masks
+from poker.trainer.ranges import COMBOS, COMBO_MASKS, NUM_COMBOS
+
+
+def board_runouts(board_cards, max_runouts=1200, rng=random):
+    """The cards completing the board: every runout if there are few enough, else a random sample."""
+    dead = card_mask(board_cards)
+    deck = [c for c in FULL_DECK if not dead >> c & 1]
+    missing = 5 - len(board_cards)
+    count = 1
+    for k in range(missing):
+        count = count * (len(deck) - k) // (k + 1)
+    if count <= max_runouts:
+        return list(combinations(deck, missing)), True
+    return [rng.sample(deck, missing) for _ in range(max_runouts)], False
+
+
+def _score_combos(indices, board, scores):
+    for i in indices:
+        a, b = COMBOS[i]
+        masks = board[:]
+        masks[a & 3] |= RANK_BIT[a]
+        masks[b & 3] |= RANK_BIT[b]
+        scores[i] = evaluate_masks(*masks)
+
+
+def _sweep(hero, villain, villain_weights, scores, wins, totals):
+    """
+    Adds to wins[h] / totals[h] the villain weight each hero combo beats
+    (ties count half) and faces, for hero and villain lists sorted by score.
+    """
+    total = 0.0
+    card_total = [0.0] * 52
+    for v in villain:
+        w = villain_weights[v]
+        a, b = COMBOS[v]
+        total += w
+        card_total[a] += w
+        card_total[b] += w
+
+    less = 0.0
+    less_card = [0.0] * 52
+    j = 0
+    n = len(villain)
+    k = 0
+    while k < len(hero):
+        s = scores[hero[k]]
+        while j < n and scores[villain[j]] < s:
+            v = villain[j]
+            w = villain_weights[v]
+            a, b = COMBOS[v]
+            less += w
+            less_card[a] += w
+            less_card[b] += w
+            j += 1
+        equal = 0.0
+        equal_card = {}
+        jj = j
+        while jj < n and scores[villain[jj]] == s:
+            v = villain[jj]
+            w = villain_weights[v]
+            a, b = COMBOS[v]
+            equal += w
+            equal_card[a] = equal_card.get(a, 0.0) + w
+            equal_card[b] = equal_card.get(b, 0.0) + w
+            jj += 1
+        while k < len(hero) and scores[hero[k]] == s:
+            h = hero[k]
+            a, b = COMBOS[h]
+            # the villain's copy of this exact combo was subtracted twice; it always ties
+            same = villain_weights[h]
+            win = less - less_card[a] - less_card[b]
+            tie = equal - equal_card.get(a, 0.0) - equal_card.get(b, 0.0) + same
+            wins[h] += win + tie / 2
+            totals[h] += total - card_total[a] - card_total[b] + same
+            k += 1
+
+
+def range_vs_range(hero_weights, villain_weights, board_cards=(), max_runouts=1200, rng=random):
+    """
+    Equity of two weighted ranges against each other on `board_cards`.
+
+    Returns overall equities for both ranges plus per-combo equity vectors
+    (1326 entries, None for combos that are not in the range or are blocked
+    by the board or the whole other range).
+    """
+    dead = card_mask(board_cards)
+    hero_support = [i for i in range(NUM_COMBOS) if hero_weights[i] > 0 and not COMBO_MASKS[i] & dead]
+    villain_support = [i for i in range(NUM_COMBOS) if villain_weights[i] > 0 and not COMBO_MASKS[i] & dead]
+    if not hero_support or not villain_support:
+        raise ValueError("Both ranges need at least one combo that is not blocked by the board.")
+
+    runouts, exact = board_runouts(board_cards, max_runouts, rng)
+    base = suit_masks(board_cards)
+    union = sorted(set(hero_support) | set(villain_support))
+    scores = [0] * NUM_COMBOS
+    hero_wins = [0.0] * NUM_COMBOS
+    hero_totals = [0.0] * NUM_COMBOS
+    villain_wins = [0.0] * NUM_COMBOS
+    villain_totals = [0.0] * NUM_COMBOS
+    for runout in runouts:
+        runout_dead = card_mask(runout)
+        board = base[:]
+        for c in runout:
+            board[c & 3] |= RANK_BIT[c]
+        _score_combos([i for i in union if not COMBO_MASKS[i] & runout_dead], board, scores)
+        hero = sorted((i for i in hero_support if not COMBO_MASKS[i] & runout_dead), key=scores.__getitem__)
+        villain = sorted((i for i in villain_support if not COMBO_MASKS[i] & runout_dead), key=scores.__getitem__)
+        _sweep(hero, villain, villain_weights, scores, hero_wins, hero_totals)
+        _sweep(villain, hero, hero_weights, scores, villain_wins, villain_totals)
+
+    def summarize(support, weights, wins, totals):
+        combo_equity = [None] * NUM_COMBOS
+        won = faced = 0.0
+        for i in support:
+            if totals[i] > 0:
+                combo_equity[i] = wins[i] / totals[i]
+                won += weights[i] * wins[i]
+                faced += weights[i] * totals[i]
+        return (won / faced if faced else 0.0), combo_equity
+
+    hero_equity, hero_combo_equity = summarize(hero_support, hero_weights, hero_wins, hero_totals)
+    villain_equity, villain_combo_equity = summarize(villain_support, villain_weights, villain_wins, villain_totals)
+    return {
+        "hero_equity": hero_equity,
+        "villain_equity": villain_equity,
+        "hero_combo_equity": hero_combo_equity,
+        "villain_combo_equity": villain_combo_equity,
+        "runouts": len(runouts),
+        "exact": exact,
+    }
+
+
+def equity_matrix(hero_weights, villain_weights, board_cards=(), max_runouts=1200, rng=random):
+    """
+    Pairwise hero equity of every hero combo against every villain combo.
+
+    Returns (hero_combos, villain_combos, matrix) where matrix[r][c] is the
+    equity of hero_combos[r] against villain_combos[c], or None when the two
+    share a card. The villain's matrix is 1 - the transpose. Cost grows with
+    the product of the range sizes, so this is meant for the narrow ranges of
+    a puzzle spot; use range_vs_range for whole ranges.
+    """
+    dead = card_mask(board_cards)
+    hero_combos = [i for i in range(NUM_COMBOS) if hero_weights[i] > 0 and not COMBO_MASKS[i] & dead]
+    villain_combos = [i for i in range(NUM_COMBOS) if villain_weights[i] > 0 and not COMBO_MASKS[i] & dead]
+    runouts, _ = board_runouts(board_cards, max_runouts, rng)
+    base = suit_masks(board_cards)
+    union = sorted(set(hero_combos) | set(villain_combos))
+    scores = [0] * NUM_COMBOS
+    won = [[0.0] * len(villain_combos) for _ in hero_combos]
+    seen = [[0] * len(villain_combos) for _ in hero_combos]
+    for runout in runouts:
+        runout_dead = card_mask(runout)
+        board = base[:]
+        for c in runout:
+            board[c & 3] |= RANK_BIT[c]
+        _score_combos([i for i in union if not COMBO_MASKS[i] & runout_dead], board, scores)
+        live_villain = [
+            (col, v, scores[v], COMBO_MASKS[v]) for col, v in enumerate(villain_combos)
+            if not COMBO_MASKS[v] & runout_dead
+        ]
+        for row, h in enumerate(hero_combos):
+            h_mask = COMBO_MASKS[h]
+            if h_mask & runout_dead:
+                continue
+            s = scores[h]
+            won_row, seen_row = won[row], seen[row]
+            for col, v, vs, v_mask in live_villain:
+                if v_mask & h_mask:
+                    continue
+                seen_row[col] += 1
+                if s > vs:
+                    won_row[col] += 1.0
+                elif s == vs:
+                    won_row[col] += 0.5
+
+    matrix = [
+        [w / n if n else None for w, n in zip(won_row, seen_row)]
+        for won_row, seen_row in zip(won, seen)
+    ]
+    return hero_combos, villain_combos, matrix
+
+
+def class_index(combo):
+    """
+    Cell of a combo's starting-hand class in a 13x13 grid (same layout as
+    game_ai.preflop_index): suited classes above the diagonal at
+    high * 13 + low, offsuit below at low * 13 + high, pairs on it.
+    """
+    a, b = COMBOS[combo]
+    high, low = a >> 2, b >> 2
+    if a & 3 == b & 3:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_grid(villain_weights, board_cards=(), max_runouts=1200, rng=random):
+    """
+    Equity of each of the 169 starting-hand classes against a villain range.
+
+    Every combo not blocked by the board plays the villain range on the same
+    runouts in one pass: each runout scores all 1326 combos once and a single
+    sweep credits every combo at the same time. A class's equity is the
+    total of its combos' wins over the total villain weight they faced, so
+    combos that card removal makes less likely count for less.
+
+    Returns (169 equities by `class_index`, None where no combo of the class
+    is live, runouts used, whether the runouts were exhaustive).
+    """
+    dead = card_mask(board_cards)
+    hero_support = [i for i in range(NUM_COMBOS) if not COMBO_MASKS[i] & dead]
+    villain_support = [i for i in hero_support if villain_weights[i] > 0]
+    if not villain_support:
+        raise ValueError("The villain range needs at least one combo that is not blocked by the board.")
+
+    runouts, exact = board_runouts(board_cards, max_runouts, rng)
+    base = suit_masks(board_cards)
+    scores = [0] * NUM_COMBOS
+    wins = [0.0] * NUM_COMBOS
+    totals = [0.0] * NUM_COMBOS
+    for runout in runouts:
+        runout_dead = card_mask(runout)
+        board = base[:]
+        for c in runout:
+            board[c & 3] |= RANK_BIT[c]
+        hero = [i for i in hero_support if not COMBO_MASKS[i] & runout_dead]
+        _score_combos(hero, board, scores)
+        hero.sort(key=scores.__getitem__)
+        villain = [i for i in hero if villain_weights[i] > 0]
+        _sweep(hero, villain, villain_weights, scores, wins, totals)
+
+    class_wins = [0.0] * 169
+    class_totals = [0.0] * 169
+    for i in hero_support:
+        cell = class_index(i)
+        class_wins[cell] += wins[i]
+        class_totals[cell] += totals[i]
+    grid = [w / t if t > 0 else None for w, t in zip(class_wins, class_totals)]
+    return grid, len(runouts), exact
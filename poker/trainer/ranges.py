@@ -0,0 +1,299 @@
+# poker/trainer/ranges.py
+"""
+Starting-hand combos as indices into a fixed 1326-entry table.
+
+Combo `i` is the pair of card ints COMBOS[i] = (high, low) with high > low,
+numbered high * (high - 1) / 2 + low, so a range is simply a list of 1326
+weights (0.0 = not in the range). COMBO_MASKS holds each combo's 52-bit card
+mask for card-removal checks against a board or another hand.
+
+`parse_range` compiles standard range notation ('22+', 'ATs+', 'KQo-K9o',
+'AKs:0.5', 'AsKd') into a cached `Range`: the weight vector, a 1326-bit
+membership mask and a cumulative-weight table for sampling combos.
+
+`compile_ranges` keeps compiled ranges in a binary artifact on disk (the
+combo indices and weights of every range), named by a hash of the
+notation, so server workers and app reruns start by reading the file
+instead of parsing the notation again. It is a startup cache only: each
+process decodes the file into its own `Range` objects, so no memory is
+shared between processes.
+"""
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect
+from functools import lru_cache
+
+from poker.metrics import METRICS
+from poker.trainer.evaluator import RANK_CHARS, SUIT_CHARS, card_from_str
+
+NUM_COMBOS = 1326
+
+COMBOS = tuple((high, low) for high in range(52) for low in range(high))
+COMBO_MASKS = tuple(1 << high | 1 << low for high, low in COMBOS)
+
+
+def combo_index(card1, card2):
+    high, low = (card1, card2) if card1 > card2 else (card2, card1)
+    return high * (high - 1) // 2 + low
+
+
+def hand_class_combos(hand_class):
+    """
+    Combo indices of a starting-hand class such as 'QQ', 'AKs', 'AKo', or
+    'AK' (suited and offsuit), or of one exact hand such as 'AsKd'.
+    """
+    if len(hand_class) == 4:
+        return [combo_index(card_from_str(hand_class[:2]), card_from_str(hand_class[2:]))]
+    r1 = RANK_CHARS.index(hand_class[0].upper())
+    r2 = RANK_CHARS.index(hand_class[1].upper())
+    kind = hand_class[2].lower() if len(hand_class) > 2 else ''
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if r1 == r2 and s2 <= s1:
+                continue
+            if (kind == 's' and s1 != s2) or (kind == 'o' and s1 == s2):
+                continue
+            combos.append(combo_index(r1 * 4 + s1, r2 * 4 + s2))
+    return combos
+
+
+def range_vector(hand_classes, weight=1.0):
+    """Weight vector of a range given as a list of hand classes."""
+    weights = [0.0] * NUM_COMBOS
+    for hand_class in hand_classes:
+        for i in hand_class_combos(hand_class):
+            weights[i] = weight
+    return weights
+
+
+def live_combos(weights, dead_mask=0):
+    """(index, weight) of every combo with positive weight that avoids the dead cards."""
+    return [(i, w) for i, w in enumerate(weights) if w > 0 and not COMBO_MASKS[i] & dead_mask]
+
+
+# --- Range notation ---
+class Range:
+    """A compiled range; build with parse_range, which caches one per notation string."""
+    __slots__ = ('text', 'weights', 'mask', 'combos', 'cum_weights', 'total')
+
+    def __init__(self, text, weights):
+        self.text = text
+        self.weights = tuple(weights)
+        self.combos = tuple(i for i, w in enumerate(self.weights) if w > 0)
+        self.mask = 0
+        self.cum_weights = []
+        self.total = 0.0
+        for i in self.combos:
+            self.mask |= 1 << i
+            self.total += self.weights[i]
+            self.cum_weights.append(self.total)
+
+    @classmethod
+    def from_combos(cls, text, combos, weights):
+        vector = [0.0] * NUM_COMBOS
+        for i, w in zip(combos, weights):
+            vector[i] = w
+        return cls(text, vector)
+
+    def __len__(self):
+        return len(self.combos)
+
+    def __contains__(self, combo):
+        return bool(self.mask >> combo & 1)
+
+    def sample(self, dead_mask=0, rng=random, tries=16):
+        """
+        A combo index drawn by weight among the combos that avoid
+        `dead_mask`, or None if every combo in the range is blocked.
+        """
+        combos, cum_weights = self.combos, self.cum_weights
+        if not combos:
+            return None
+        # rejection sampling is almost always done after one or two draws
+        for _ in range(tries):
+            i = combos[bisect(cum_weights, rng.random() * self.total)]
+            if not COMBO_MASKS[i] & dead_mask:
+                return i
+        live = [i for i in combos if not COMBO_MASKS[i] & dead_mask]
+        if not live:
+            return None
+        return rng.choices(live, [self.weights[i] for i in live])[0]
+
+
+def _rank(char, token):
+    rank = RANK_CHARS.find(char.upper())
+    if rank < 0:
+        raise ValueError(f"Invalid rank '{char}' in range '{token}'")
+    return rank
+
+
+def _hand_class(text, token):
+    """(high rank, low rank, 's' / 'o' / '') of a class like 'AKs', ordered high first."""
+    if len(text) not in (2, 3) or (len(text) == 3 and text[2].lower() not in 'so'):
+        raise ValueError(f"Invalid hand class in range '{token}'")
+    r1, r2 = _rank(text[0], token), _rank(text[1], token)
+    kind = text[2].lower() if len(text) == 3 else ''
+    if r1 == r2 and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: '{token}'")
+    return max(r1, r2), min(r1, r2), kind
+
+
+def _class_name(high, low, kind):
+    return RANK_CHARS[high] + RANK_CHARS[low] + kind
+
+
+def _expand(token):
+    """Hand classes (or one exact hand) named by a single range token."""
+    if len(token) == 4 and token[1].lower() in SUIT_CHARS and token[3].lower() in SUIT_CHARS:
+        return [token]
+    if '-' in token:
+        first, last = token.split('-', 1)
+        h1, l1, k1 = _hand_class(first, token)
+        h2, l2, k2 = _hand_class(last, token)
+        if k1 != k2:
+            raise ValueError(f"Range ends must be the same kind of hand: '{token}'")
+        if h1 == l1 and h2 == l2:  # 'TT-77'
+            return [_class_name(r, r, '') for r in range(min(h1, h2), max(h1, h2) + 1)]
+        if h1 != h2 or h1 == l1 or h2 == l2:
+            raise ValueError(f"Range ends must share their high card: '{token}'")
+        return [_class_name(h1, low, k1) for low in range(min(l1, l2), max(l1, l2) + 1)]
+    if token.endswith('+'):
+        high, low, kind = _hand_class(token[:-1], token)
+        if high == low:  # '22+'
+            return [_class_name(r, r, '') for r in range(low, 13)]
+        return [_class_name(high, k, kind) for k in range(low, high)]  # 'ATs+'
+    return [_class_name(*_hand_class(token, token))]
+
+
+@lru_cache(maxsize=256)
+def parse_range(text):
+    """
+    Compiles a comma-separated range such as '22+, ATs+, KQo-K9o, AKs:0.5'.
+    A ':weight' suffix sets the weight of every combo in that token (default
+    1.0); later tokens override earlier ones.
+    """
+    weights = [0.0] * NUM_COMBOS
+    for token in text.replace(' ', '').split(','):
+        if not token:
+            continue
+        token, _, weight_text = token.partition(':')
+        try:
+            weight = float(weight_text) if weight_text else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight in range token '{token}:{weight_text}'")
+        if weight < 0:
+            raise ValueError(f"Negative weight in range token '{token}:{weight_text}'")
+        for hand_class in _expand(token):
+            for i in hand_class_combos(hand_class):
+                weights[i] = weight
+    return Range(text, weights)
+
+
+METRICS.register_cache("parse_range", parse_range.cache_info)
+
+
+# --- Compiled range artifacts ---
+# little-endian: magic, format version, range count; then per range the
+# notation length, combo count and notation, and finally every range's
+# combo indices (uint16) followed by its weights (float64)
+_MAGIC = b'PKRG'
+_FORMAT = 1
+_HEADER = struct.Struct('<4sHI')
+_ENTRY = struct.Struct('<HH')
+
+
+def save_ranges(ranges, path):
+    """Writes compiled ranges to `path`, atomically so concurrent readers never see a partial file."""
+    ranges = list(ranges)
+    index = [_HEADER.pack(_MAGIC, _FORMAT, len(ranges))]
+    data = []
+    for r in ranges:
+        text = r.text.encode()
+        index.append(_ENTRY.pack(len(text), len(r.combos)) + text)
+        combos = array('H', r.combos)
+        weights = array('d', (r.weights[i] for i in r.combos))
+        if sys.byteorder == 'big':
+            combos.byteswap()
+            weights.byteswap()
+        data += [combos.tobytes(), weights.tobytes()]
+    # a fresh, unguessable temp file: a predictable name could be planted as a symlink
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b''.join(index + data))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_ranges(path, expected=None):
+    """
+    {notation: Range} from an artifact written by `save_ranges`; raises
+    ValueError if it is not one, or if `expected` is given and the artifact
+    does not hold exactly those notations.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        try:
+            magic, version, count = _HEADER.unpack_from(buf, 0)
+        except struct.error:
+            raise ValueError(f"Truncated range artifact: {path}")
+        if magic != _MAGIC or version != _FORMAT:
+            raise ValueError(f"Not a version {_FORMAT} range artifact: {path}")
+        offset = _HEADER.size
+        entries = []
+        ranges = {}
+        try:
+            for _ in range(count):
+                length, n = _ENTRY.unpack_from(buf, offset)
+                offset += _ENTRY.size
+                entries.append((buf[offset:offset + length].decode(), n))
+                offset += length
+            for text, n in entries:
+                combos = array('H', buf[offset:offset + 2 * n])
+                offset += 2 * n
+                weights = array('d', buf[offset:offset + 8 * n])
+                offset += 8 * n
+                if sys.byteorder == 'big':
+                    combos.byteswap()
+                    weights.byteswap()
+                ranges[text] = Range.from_combos(text, combos, weights)
+        except (struct.error, IndexError, UnicodeDecodeError):
+            raise ValueError(f"Corrupt range artifact: {path}")
+        if offset != len(buf):
+            raise ValueError(f"Corrupt range artifact: {path}")
+    if expected is not None and set(ranges) != set(expected):
+        raise ValueError(f"Range artifact holds other ranges than expected: {path}")
+    return ranges
+
+
+def compile_ranges(texts, cache_dir=None):
+    """
+    {notation: Range} for every notation in `texts`. With a `cache_dir` the
+    ranges come from the artifact named by a hash of the notations, which is
+    written on first use; any problem with the cache, including a stale or
+    planted file holding other notations, falls back to parsing and rewrites it.
+    """
+    texts = sorted(set(texts))
+    if not cache_dir:
+        return {text: parse_range(text) for text in texts}
+    digest = hashlib.sha256('\n'.join([str(_FORMAT)] + texts).encode()).hexdigest()[:20]
+    path = os.path.join(cache_dir, f"ranges-{digest}.bin")
+    try:
+        return load_ranges(path, texts)
+    except (OSError, ValueError):
+        pass
+    ranges = {text: parse_range(text) for text in texts}
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        save_ranges(ranges.values(), path)
+    except OSError:
+        pass
+    return ranges
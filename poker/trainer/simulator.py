@@ -0,0 +1,185 @@
+# poker/trainer/simulator.py
+"""
+Batch bot-vs-bot self-play on the headless HeadsUpGame engine.
+
+Policies are callables `policy(game, seat) -> {'action', 'amount'}`.
+`advisor_policy` adapts the recommendation-style bots (PokerBot, GameAI)
+and `strategy_policy` adapts a trained StrategyPolicy.
+
+Hands are played as duplicate pairs: each deal is played twice with the
+players swapping seats (and so cards and position), which cancels most of
+the card luck out of the result. Stacks are reset every hand. Results are
+reported as big blinds per 100 hands for the first policy, with a 95%
+confidence interval computed over the duplicate pairs.
+
+Usage:
+    python -m poker.trainer.simulator bot game_ai --hands 100000 --workers 4
+"""
+import argparse
+import math
+import random
+import time
+
+from poker.trainer.heads_up_game import HeadsUpGame
+
+
+# --- Policy adapters ---
+def advisor_policy(advisor):
+    """Adapts a bot exposing get_action / get_ai_action(hole_cards, community_cards, position, ...)."""
+    get_action = getattr(advisor, 'get_ai_action', None) or advisor.get_action
+
+    def policy(game, seat):
+        position = 'late' if seat == game.button else 'early'
+        decision = get_action(
+            game.hole_card_strings(seat), game.board_strings(), position,
+            game.stacks[seat], game.pot, 2, game.history
+        )
+        # pot-fraction sizes (pot * 0.75) come out fractional; the game plays whole chips
+        return {**decision, 'amount': int(round(decision.get('amount', 0)))}
+    return policy
+
+
+def heads_up_policy(game_ai):
+    """Adapts the console game's threshold AI (GameAI.get_heads_up_action)."""
+    def policy(game, seat):
+        return game_ai.get_heads_up_action(
+            game.hole_card_strings(seat), game.board_strings(), game.stacks[seat], game.to_call(seat)
+        )
+    return policy
+
+
+def strategy_policy(strategy):
+    """Adapts a trained poker.trainer.strategy.StrategyPolicy."""
+    def policy(game, seat):
+        return strategy.get_action(
+            game.hole_card_strings(seat), game.board_strings(), game.history,
+            game.to_call(seat), game.stacks[seat], game.pot
+        )
+    return policy
+
+
+def make_policy(name, rng=random):
+    """
+    Builds a policy from a picklable name, so worker processes can create
+    their own: 'bot', 'game_ai', 'heads_up', or a path to a strategy .json file.
+    The policy's own random choices (bluffs, mixed strategies) draw from `rng`.
+    """
+    if name == 'bot':
+        from poker.trainer.bot import PokerBot
+        return advisor_policy(PokerBot(rng=rng))
+    if name == 'game_ai':
+        from poker.trainer.game_ai import GameAI
+        return advisor_policy(GameAI(rng))
+    if name == 'heads_up':
+        from poker.trainer.game_ai import GameAI
+        return heads_up_policy(GameAI(rng))
+    if name.endswith('.json'):
+        from poker.trainer.strategy import StrategyPolicy
+        return strategy_policy(StrategyPolicy.load(name, rng=rng))
+    raise ValueError(f"Unknown policy: {name}")
+
+
+# --- Self-play ---
+def play_hand(game, policies, button, deal):
+    """Plays one hand from fresh stacks; returns seat 0's net chips."""
+    start = game.stacks[0]
+    game.start_hand(button=button, deal=deal)
+    while not game.hand_over:
+        seat = game.to_act
+        decision = policies[seat](game, seat)
+        try:
+            game.apply_action(decision['action'], decision.get('amount', 0))
+        except ValueError:
+            # bots may suggest actions the spot doesn't allow; treat those as check/call
+            game.apply_action('call')
+    return game.stacks[0] - start
+
+
+def play_pairs(policy_a, policy_b, num_pairs, seed=None, stack=1000, small_blind=5, big_blind=10):
+    """
+    Plays `num_pairs` duplicate pairs of hands and returns running sums of
+    policy A's per-pair net chips: (pairs, sum, sum of squares).
+    """
+    rng = random.Random(seed)
+    game = HeadsUpGame(stacks=(stack, stack), small_blind=small_blind, big_blind=big_blind, rng=rng)
+    total = total_sq = 0.0
+    for i in range(num_pairs):
+        deal = rng.sample(range(52), 9)
+        button = i & 1
+        game.stacks = [stack, stack]
+        net = play_hand(game, (policy_a, policy_b), button, deal)
+        game.stacks = [stack, stack]
+        # same cards and button with the players swapped: A now holds B's cards in B's seat
+        net -= play_hand(game, (policy_b, policy_a), button, deal)
+        total += net
+        total_sq += net * net
+    return num_pairs, total, total_sq
+
+
+def _play_chunk(args):
+    name_a, name_b, num_pairs, seed, settings = args
+    # each policy gets its own stream, so a chunk replays exactly from its seed
+    policy_a = make_policy(name_a, random.Random(f"{seed}:a"))
+    policy_b = make_policy(name_b, random.Random(f"{seed}:b"))
+    return play_pairs(policy_a, policy_b, num_pairs, seed, **settings)
+
+
+def run_self_play(name_a, name_b, num_hands=100000, workers=1, seed=None,
+                  stack=1000, small_blind=5, big_blind=10):
+    """
+    Plays about `num_hands` hands of policy A against policy B (by name, see
+    `make_policy`) split over `workers` processes, and returns a summary:
+    bb/100 for A with a 95% confidence interval, hands played and hands/sec.
+    """
+    num_pairs = max(1, num_hands // 2)
+    settings = {'stack': stack, 'small_blind': small_blind, 'big_blind': big_blind}
+    base_seed = seed if seed is not None else random.randrange(1 << 30)
+    chunks = [
+        (name_a, name_b, num_pairs // workers + (1 if w < num_pairs % workers else 0), base_seed + w, settings)
+        for w in range(workers)
+    ]
+    chunks = [c for c in chunks if c[2] > 0]
+
+    started = time.perf_counter()
+    if workers > 1:
+        from multiprocessing import Pool
+        with Pool(len(chunks)) as pool:
+            results = pool.map(_play_chunk, chunks)
+    else:
+        results = [_play_chunk(c) for c in chunks]
+    elapsed = time.perf_counter() - started
+
+    pairs = sum(r[0] for r in results)
+    total = sum(r[1] for r in results)
+    total_sq = sum(r[2] for r in results)
+    mean = total / pairs
+    variance = max(total_sq / pairs - mean * mean, 0.0) * pairs / max(pairs - 1, 1)
+    # per pair -> per hand -> per 100 hands in big blinds
+    scale = 100 / 2 / big_blind
+    margin = 1.96 * math.sqrt(variance / pairs) * scale
+    hands = pairs * 2
+    return {
+        "policy_a": name_a,
+        "policy_b": name_b,
+        "hands": hands,
+        "bb_per_100": mean * scale,
+        "ci95_low": mean * scale - margin,
+        "ci95_high": mean * scale + margin,
+        "seconds": elapsed,
+        "hands_per_second": hands / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bot-vs-bot heads-up self-play")
+    parser.add_argument("policy_a")
+    parser.add_argument("policy_b")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    result = run_self_play(args.policy_a, args.policy_b, args.hands, args.workers, args.seed)
+    print(f"{result['policy_a']} vs {result['policy_b']}: {result['hands']} hands")
+    print(f"  {result['bb_per_100']:+.2f} bb/100 "
+          f"(95% CI {result['ci95_low']:+.2f} .. {result['ci95_high']:+.2f})")
+    print(f"  {result['hands_per_second']:.0f} hands/sec over {result['seconds']:.1f}s")
@@ -0,0 +1,152 @@
+# poker/trainer/strategy.py
+"""
+Serves trained CFR average strategies as a bot policy.
+
+A strategy file holds the card abstraction settings used in training plus
+the normalised average strategy of every infoset, keyed the way `cfr.py`
+keys them: (equity bucket, street, betting history), with actions
+0 = fold, 1 = check/call, 2 = bet/raise. At load time the strategies are
+packed into one flat array of cumulative probabilities, so picking an
+action is a bucket read, a dict lookup and one random draw.
+
+The bucket tables for the strategy's abstraction are built once, offline,
+next to the strategy file, and loaded with it, so serving never computes an
+equity:
+    python -m poker.trainer.strategy average_strategy.json --processes 16
+"""
+import argparse
+import json
+import os
+import random
+import time
+from array import array
+
+from poker.trainer.abstraction import CardAbstraction, STREETS
+from poker.trainer.evaluator import card_from_str
+
+FOLD, CALL, RAISE = 0, 1, 2
+ACTION_IDS = {'fold': FOLD, 'check': CALL, 'call': CALL, 'bet': RAISE, 'raise': RAISE}
+
+UNIFORM = (1.0 / 3, 1.0 / 3, 1.0 / 3)
+
+
+def average_strategy(strategy_sum):
+    """Normalises CFR strategy sums into action probabilities per infoset."""
+    strategy = {}
+    for infoset, sums in strategy_sum.items():
+        total = sum(sums)
+        strategy[infoset] = [s / total for s in sums] if total > 0 else list(UNIFORM)
+    return strategy
+
+
+def save_strategy(strategy_sum, path, abstraction):
+    infosets = [
+        {'bucket': bucket, 'street': street, 'history': list(history), 'probs': probs}
+        for (bucket, street, history), probs in average_strategy(strategy_sum).items()
+    ]
+    with open(path, 'w') as f:
+        json.dump({'abstraction': abstraction.settings(), 'infosets': infosets}, f)
+
+
+def bucket_tables_path(path):
+    """Where the bucket tables of the strategy file `path` live: average_strategy.json -> average_strategy.buckets"""
+    return os.path.splitext(path)[0] + '.buckets'
+
+
+def build_bucket_tables(path, processes=1):
+    """Builds and saves the bucket tables of the strategy file `path`; hours of CPU, see CardAbstraction.build_table."""
+    with open(path) as f:
+        abstraction = CardAbstraction(**json.load(f)['abstraction'])
+    for board_size, street in STREETS.items():
+        started = time.perf_counter()
+        abstraction.build_table(board_size, processes)
+        print(f"{street}: {time.perf_counter() - started:.0f}s")
+    abstraction.save(bucket_tables_path(path))
+
+
+class StrategyPolicy:
+    """
+    Bot policy backed by a CFR average strategy. Infosets missing from the
+    strategy are played uniformly, as CFR itself does for unvisited nodes.
+    """
+
+    def __init__(self, strategy, abstraction, bet_fraction=0.75, rng=random):
+        self.abstraction = abstraction
+        self.bet_fraction = bet_fraction
+        self.rng = rng
+        self._rows = {}
+        self._cumulative = array('d')
+        for infoset, probs in strategy.items():
+            self._rows[infoset] = len(self._cumulative)
+            self._cumulative.extend([probs[0], probs[0] + probs[1]])
+
+    @classmethod
+    def load(cls, path, tables=None, **kwargs):
+        """
+        Loads a strategy file with its bucket tables (by default
+        `bucket_tables_path(path)`); raises ValueError if the tables are
+        missing or were built for different abstraction settings.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        tables = tables or bucket_tables_path(path)
+        if not os.path.exists(tables):
+            raise ValueError(f"No bucket tables at {tables}; build them with: python -m poker.trainer.strategy {path}")
+        abstraction = CardAbstraction.load(tables)
+        if abstraction.settings() != data['abstraction']:
+            raise ValueError(f"The bucket tables at {tables} do not match the abstraction of {path}")
+        strategy = {
+            (row['bucket'], row['street'], tuple(row['history'])): row['probs']
+            for row in data['infosets']
+        }
+        return cls(strategy, abstraction, **kwargs)
+
+    def infoset_key(self, hole_cards, community_cards, history=()):
+        """
+        Infoset of a live hand. Cards are strings such as 'As'; history is the
+        hand's action names ('check', 'bet', ...) or action ids.
+        """
+        hole = [card_from_str(c) for c in hole_cards]
+        board = [card_from_str(c) for c in community_cards]
+        bucket = self.abstraction.bucket(hole, board)
+        actions = tuple(ACTION_IDS[a] if isinstance(a, str) else a for a in history)
+        return (bucket, STREETS[len(board)], actions)
+
+    def action_probabilities(self, infoset):
+        row = self._rows.get(infoset)
+        if row is None:
+            return UNIFORM
+        fold, call = self._cumulative[row], self._cumulative[row + 1]
+        return (fold, call - fold, 1.0 - call)
+
+    def sample_action(self, infoset):
+        row = self._rows.get(infoset)
+        r = self.rng.random()
+        if row is None:
+            return int(r * 3)
+        if r < self._cumulative[row]:
+            return FOLD
+        if r < self._cumulative[row + 1]:
+            return CALL
+        return RAISE
+
+    def get_action(self, hole_cards, community_cards, history=(), current_bet=0, stack_size=1000, pot_size=0):
+        """Returns {'action', 'amount'} in the format used by the heads-up game."""
+        action = self.sample_action(self.infoset_key(hole_cards, community_cards, history))
+        if action == RAISE and stack_size > current_bet:
+            amount = max(int(pot_size * self.bet_fraction), current_bet * 2, 1)
+            return {'action': 'bet', 'amount': min(amount, stack_size)}
+        if action == FOLD and current_bet > 0:
+            return {'action': 'fold', 'amount': 0}
+        if current_bet > 0:
+            return {'action': 'call', 'amount': min(current_bet, stack_size)}
+        return {'action': 'check', 'amount': 0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the bucket tables a strategy file is served with")
+    parser.add_argument("strategy", help="strategy file written by save_strategy")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    build_bucket_tables(args.strategy, args.processes)
+    print(f"wrote {bucket_tables_path(args.strategy)}")
@@ -0,0 +1,32 @@
+# hand_grid_ui.py
+"""
+13x13 starting-hand equity chart for the Streamlit Poker Trainer
+"""
+import streamlit as st
+
+def cell_color(equity):
+    # red below 50% equity, green above, grey for hands the board blocks
+    if equity is None:
+        return '#555'
+    if equity >= 50:
+        shade = int(255 - (equity - 50) * 4)
+        return f'rgb({shade},220,{shade})'
+    shade = int(255 - (50 - equity) * 4)
+    return f'rgb(230,{shade},{shade})'
+
+def render_hand_grid(grid):
+    rows = []
+    for hands, equities in zip(grid["hands"], grid["equity"]):
+        cells = ''.join(
+            f'<td style="background:{cell_color(equity)};padding:2px 4px;text-align:center;'
+            f'font-size:11px;color:#111;border:1px solid #fff;">'
+            f'{hand}<br>{"-" if equity is None else f"{equity:.0f}"}</td>'
+            for hand, equity in zip(hands, equities)
+        )
+        rows.append(f'<tr>{cells}</tr>')
+    st.markdown(
+        f'<table style="border-collapse:collapse;margin:auto;">{"".join(rows)}</table>',
+        unsafe_allow_html=True,
+    )
+    note = "exact" if grid["exact"] else "sampled"
+    st.caption(f"Equity (%) of each starting hand against the range, over {grid['runouts']} {note} runouts.")
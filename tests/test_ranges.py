@@ -0,0 +1,21 @@
+import os
+
+from poker.trainer.profiles import ProfileRegistry
+from poker.trainer.ranges import load_ranges, parse_range, save_ranges
+
+BUILTIN = {'tight': '99+, AQs+, AKo', 'loose': '22+, A2s+, KTo+'}
+
+
+def test_registry_survives_artifact_with_other_ranges(tmp_path):
+    cache_dir = str(tmp_path)
+    ProfileRegistry(BUILTIN, cache_dir=cache_dir)
+    (name,) = os.listdir(cache_dir)
+    path = os.path.join(cache_dir, name)
+
+    # a valid artifact under the expected name, holding other notations
+    save_ranges([parse_range('AA'), parse_range('KK')], path)
+
+    registry = ProfileRegistry(BUILTIN, cache_dir=cache_dir)
+    for profile, notation in BUILTIN.items():
+        assert registry.get(profile).weights == parse_range(notation).weights
+    assert set(load_ranges(path)) == set(BUILTIN.values())